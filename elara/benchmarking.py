@@ -5,11 +5,12 @@ import numpy as np
 from typing import Optional
 import logging
 import json
+from concurrent.futures import ProcessPoolExecutor
 from matplotlib import pyplot as plt
 
 from elara.factory import WorkStation, Tool
 from elara import get_benchmark_data
-from elara.helpers import try_sort_on_numeric_index
+from elara.helpers import try_sort_on_numeric_index, read_log
 
 
 class BenchmarkTool(Tool):
@@ -45,6 +46,8 @@ class BenchmarkTool(Tool):
 class CsvComparison(BenchmarkTool):
 
     output_value_fields = ['trips_benchmark', 'trip_simulation']
+    simulation_is_log = False  # logs may be written as parquet (see config.output_format)
+    benchmark_is_log = False
 
     def __init__(self, config, mode, groupby_person_attribute=None, **kwargs) -> None:
         """
@@ -82,14 +85,22 @@ class CsvComparison(BenchmarkTool):
         # Read benchmark and simulation csv files
         self.logger.debug(f"Loading BM data from {self.benchmark_data_path}")
         self.logger.debug(f"Using indices '{self.index_fields}'")
-        benchmarks_df = pd.read_csv(
-            self.benchmark_data_path, index_col=self.index_fields)
+        if self.benchmark_is_log:
+            benchmarks_df = read_log(
+                self.benchmark_data_path, self.config.output_format, index_col=self.index_fields)
+        else:
+            benchmarks_df = pd.read_csv(
+                self.benchmark_data_path, index_col=self.index_fields)
 
         simulation_path = os.path.join(
             self.config.output_path, self.simulation_name)
         self.logger.debug(f"Loading Simulation data from {simulation_path}")
-        simulation_df = pd.read_csv(
-            simulation_path, index_col=self.index_fields)
+        if self.simulation_is_log:
+            simulation_df = read_log(
+                simulation_path, self.config.output_format, index_col=self.index_fields)
+        else:
+            simulation_df = pd.read_csv(
+                simulation_path, index_col=self.index_fields)
 
         # compare
         bm_df = pd.concat([benchmarks_df[self.value_field],
@@ -206,6 +217,7 @@ class TripDurationsComparison(CsvComparison):
         self.requirements = ['trip_logs']
         self.valid_modes = ["all"]
         self.simulation_name = "trip_logs_all_trips.csv"
+        self.simulation_is_log = True
         self.value_field = "duration_s"
 
         # check for mode_consistent option and remove (not a required option for managers)
@@ -1396,6 +1408,7 @@ class PassengerStopToStop(BenchmarkTool):
 
 class PlanComparisonTripStart(CsvComparison):
     simulation_name = 'trip_logs_all_trips.csv'
+    simulation_is_log = True
     requirements = ['trip_logs']
     valid_modes = ['all']
     index_fields = ['agent_id', 'seq']
@@ -1407,11 +1420,12 @@ class PlanComparisonTripStart(CsvComparison):
 class InputPlanComparisonTripStart(PlanComparisonTripStart):
     requirements = ['trip_logs', 'input_trip_logs']
     unsafe_load = True
+    benchmark_is_log = True
 
     def __init__(self, config, **kwargs) -> None:
         self.benchmark_data_path = os.path.join(
             config.output_path,
-            'input_trip_logs_all_trips.csv'
+            f'input_trip_logs_all_trips.{config.output_format}'
         )
 
         super().__init__(config=config, mode="all")
@@ -1425,6 +1439,7 @@ class InputPlanComparisonTripStart(PlanComparisonTripStart):
 
 class PlanComparisonTripDuration(CsvComparison):
     simulation_name = 'trip_logs_all_trips.csv'
+    simulation_is_log = True
     requirements = ['trip_logs']
     valid_modes = ['all']
     index_fields = ['agent_id', 'seq']
@@ -1436,12 +1451,13 @@ class PlanComparisonTripDuration(CsvComparison):
 class InputPlanComparisonTripDuration(PlanComparisonTripDuration):
     requirements = ['trip_logs', 'input_trip_logs']
     unsafe_load = True
+    benchmark_is_log = True
 
     def __init__(self, config, **kwargs) -> None:
 
         self.benchmark_data_path = os.path.join(
             config.output_path,
-            'input_trip_logs_all_trips.csv'
+            f'input_trip_logs_all_trips.{config.output_format}'
         )
 
         super().__init__(config, **kwargs)
@@ -1455,6 +1471,7 @@ class InputPlanComparisonTripDuration(PlanComparisonTripDuration):
 
 class PlanComparisonActivityStart(CsvComparison):
     simulation_name = 'trip_logs_all_activities.csv'
+    simulation_is_log = True
     requirements = ['trip_logs']
     valid_modes = ['all']
     index_fields = ['agent_id', 'seq']
@@ -1466,11 +1483,12 @@ class PlanComparisonActivityStart(CsvComparison):
 class InputPlanComparisonActivityStart(PlanComparisonActivityStart):
     requirements = ['trip_logs', 'input_trip_logs']
     unsafe_load = True
+    benchmark_is_log = True
 
     def __init__(self, config, **kwargs) -> None:
         self.benchmark_data_path = os.path.join(
             config.output_path,
-            'input_trip_logs_all_activities.csv'
+            f'input_trip_logs_all_activities.{config.output_format}'
         )
 
         super().__init__(config, **kwargs)
@@ -1484,6 +1502,7 @@ class InputPlanComparisonActivityStart(PlanComparisonActivityStart):
 
 class PlanComparisonActivityDuration(CsvComparison):
     simulation_name = 'trip_logs_all_activities.csv'
+    simulation_is_log = True
     requirements = ['trip_logs']
     valid_modes = ['all']
     index_fields = ['agent_id', 'seq']
@@ -1495,11 +1514,12 @@ class PlanComparisonActivityDuration(CsvComparison):
 class InputPlanComparisonActivityDuration(PlanComparisonActivityDuration):
     requirements = ['trip_logs', 'input_trip_logs']
     unsafe_load = True
+    benchmark_is_log = True
 
     def __init__(self, config, **kwargs) -> None:
         self.benchmark_data_path = os.path.join(
             config.output_path,
-            'input_trip_logs_all_activities.csv'
+            f'input_trip_logs_all_activities.{config.output_format}'
         )
 
         super().__init__(config, **kwargs)
@@ -1532,13 +1552,13 @@ class InputModeComparison(BenchmarkTool):
         # from input_plan_handler
         self.benchmark_data_path = os.path.join(
             config.output_path,
-            'input_trip_logs_all_trips.csv'
+            f'input_trip_logs_all_trips.{config.output_format}'
         )
 
         # from plan_handler
         self.simulation_data_path = os.path.join(
             config.output_path,
-            'trip_logs_all_trips.csv'
+            f'trip_logs_all_trips.{config.output_format}'
         )
 
         super().__init__(config, **kwargs)
@@ -1555,10 +1575,10 @@ class InputModeComparison(BenchmarkTool):
         usecols = ['agent_id', 'seq', 'mode']
         indexcols = ['agent_id', 'seq']
 
-        trips_input = pd.read_csv(
-            self.benchmark_data_path, usecols=usecols, header=0).set_index(indexcols)
-        trips_output = pd.read_csv(
-            self.simulation_data_path, usecols=usecols, header=0).set_index(indexcols)
+        trips_input = read_log(
+            self.benchmark_data_path, self.config.output_format, index_col=indexcols, columns=usecols)
+        trips_output = read_log(
+            self.simulation_data_path, self.config.output_format, index_col=indexcols, columns=usecols)
 
         trips_input.rename({'mode': 'prev_mode'}, axis=1, inplace=True)
         trips_output.rename({'mode': 'new_mode'}, axis=1, inplace=True)
@@ -1805,11 +1825,16 @@ class Cordon(BenchmarkTool):
 
         self.mode = mode
 
-        counts_df = pd.read_csv(self.benchmark_data_path)
-        links_df = pd.read_csv(self.cordon_path, index_col=0)
+        # only parse the columns used for scoring (period counts have no 'Hour' column)
+        counts_cols = {'Year', 'Hour', 'Direction', 'Site', self.mode}
+        counts_df = pd.read_csv(
+            self.benchmark_data_path, usecols=lambda c: c in counts_cols
+        )
+        links_df = pd.read_csv(self.cordon_path, usecols=['link', 'dir'])
 
         if not self.hours:
             self.hours = range(self.config.time_periods)
+        self.hours_str = tuple(str(h) for h in self.hours)
 
         for direction_name, dir_code in self.directions.items():
             self.cordon_counts.append(self.cordon_counter(
@@ -1869,6 +1894,10 @@ class CordonDirectionCount(BenchmarkTool):
 
         # Get cordon links
         self.link_ids = self.get_links(links_df, dir_code)
+        self.link_index = pd.Index(self.link_ids)
+
+        # model result columns used for scoring
+        self.select_cols = list(parent.hours_str)
 
     @staticmethod
     def get_links(links_df, direction_code):
@@ -1890,41 +1919,46 @@ class CordonDirectionCount(BenchmarkTool):
         :param counts_df: DataFrame
         :return:
         """
-        counts_array = np.zeros(len(self.hours))
-
-        df = counts_df.loc[counts_df.Year == self.year, :]
-        assert (len(df)),\
+        year_mask = counts_df.Year == self.year
+        assert year_mask.any(),\
             f'No {self.cordon_name} benchmark counts left from after filtering by {self.year}'
 
-        df = df.loc[df.Hour.isin(self.hours), :]
-        assert (len(df)),\
+        hours_mask = year_mask & counts_df.Hour.isin(self.hours)
+        assert hours_mask.any(),\
             f'No {self.cordon_name} BM counts left from after filtering by hours:{self.hours}'
 
-        df = df.loc[counts_df.Direction == self.dir_code, :]
-        site_indexes = list(set(df.Site))
-
-        for site_index in site_indexes:
-            site_df = df.loc[df.Site == site_index, :]
-            hour_counts = np.array(
-                site_df.sort_values('Hour').loc[:, self.mode])
-            assert len(hour_counts) == len(self.hours),\
-                f'Not extracted the right amount of hours {self.hours}'
+        df = counts_df.loc[
+            hours_mask & (counts_df.Direction == self.dir_code), ['Site', 'Hour', self.mode]
+        ]
+        assert (df.groupby('Site').size() == len(self.hours)).all(),\
+            f'Not extracted the right amount of hours {self.hours}'
 
-            counts_array += hour_counts
+        # sum over sites for each hour
+        return df.groupby('Hour')[self.mode].sum().reindex(
+            list(self.hours), fill_value=0
+        ).to_numpy(dtype=float)
 
-        return counts_array
-
-    def counts_to_df(self, array, source='benchmark'):
+    def get_model_results(self, result_df):
         """
-        Build dataframe from array of hourly counts.
-        :param array: np.array
-        :param source: String
+        Extract model results for cordon links, zero filling any links missing from results.
+        :param result_df: DataFrame object of model results
         :return: DataFrame
         """
-        col_names = [str(i) for i in self.hours]
-        df = pd.DataFrame(array, index=col_names).T
-        df.loc[:, 'source'] = source
-        return df
+        assert len(result_df), f"zero length results df at {self.cordon_name}."
+
+        missing = [link_id for link_id in self.link_ids if link_id not in result_df.index]
+        if missing:
+            self.logger.warning("Zero filling results for benchmark")
+            # single concat rather than growing result_df one row at a time
+            zeros_df = pd.DataFrame(
+                0, index=pd.Index(missing, name=result_df.index.name), columns=result_df.columns
+            )
+            result_df = pd.concat([result_df, zeros_df], axis=0)
+
+        model_results = result_df.loc[result_df.index.isin(
+            self.link_index), :].copy()
+        model_results.loc[:, 'mode'] = self.mode
+        return model_results
 
     def get_count(self, counts_df):
         """
@@ -1932,36 +1966,13 @@ class CordonDirectionCount(BenchmarkTool):
         :param counts_df: DataFrame
         :return:
         """
-        count = 0
-
-        df = counts_df.loc[counts_df.Year == self.year, :]
-        assert (len(df)),\
+        year_mask = counts_df.Year == self.year
+        assert year_mask.any(),\
             f'No {self.cordon_name} benchmark counts left from after filtering by {self.year}'
 
-        df = df.loc[df.Direction == self.dir_code, :]
-        site_indexes = list(set(df.Site))
-
-        for site_index in site_indexes:
-            site_df = df.loc[df.Site == site_index, :]
-
-            site_count = site_df.loc[:, self.mode].values.sum()
-
-            count += site_count
-
-        return count
-
-    @staticmethod
-    def count_to_df(count, source='benchmark'):
-        """
-        Build count dataframe from int.
-        :param count: Int
-        :param source: String
-        :return: DataFrame
-        """
-        col_names = ['counts']
-        df = pd.DataFrame([count], index=col_names).T
-        df.loc[:, 'source'] = source
-        return df
+        # sum over all sites in direction
+        mask = year_mask & (counts_df.Direction == self.dir_code)
+        return counts_df.loc[mask, self.mode].to_numpy().sum()
 
 
 class HourlyCordonDirectionCount(CordonDirectionCount):
@@ -1977,16 +1988,7 @@ class HourlyCordonDirectionCount(CordonDirectionCount):
         :return: Float
         """
         # collect all results
-        assert len(result_df), f"zero length results df at {self.cordon_name}."
-
-        for link_id in self.link_ids:
-            if link_id not in result_df.index:
-                self.logger.warning("Zero filling results for benchmark")
-                result_df.loc[link_id] = 0
-
-        model_results = result_df.loc[result_df.index.isin(
-            self.link_ids), :].copy()
-        model_results.loc[:, 'mode'] = self.mode
+        model_results = self.get_model_results(result_df)
 
         # write cordon model results
         csv_name = '{}_{}_model_results.csv'.format(
@@ -1999,11 +2001,10 @@ class HourlyCordonDirectionCount(CordonDirectionCount):
         classes_df = model_results.groupby('subpopulation').sum()
 
         # filter model results for hours
-        select_cols = [str(i) for i in self.hours]
-        classes_df = classes_df.loc[:, select_cols]
+        classes_df = classes_df.loc[:, self.select_cols]
 
         # Build model results array for scoring
-        results_array = np.array(classes_df.sum())
+        results_array = classes_df.sum(axis=0).to_numpy()
 
         # Label and write csv with counts by subpopulation
         classes_df.loc[:, 'source'] = 'model'
@@ -2013,11 +2014,13 @@ class HourlyCordonDirectionCount(CordonDirectionCount):
 
         # Get cordon counts for mode
         counts_array = self.get_counts(self.counts_df)
-        count_df = self.counts_to_df(counts_array, )
 
         # Label and write benchmark csv
-        benchmark_df = pd.concat(
-            [count_df, classes_df]).groupby('source').sum()
+        benchmark_df = pd.DataFrame(
+            [counts_array, results_array],
+            index=pd.Index(['benchmark', 'model'], name='source'),
+            columns=self.select_cols
+        )
 
         csv_name = '{}_{}_benchmark.csv'.format(
             self.cordon_name, self.direction)
@@ -2025,7 +2028,7 @@ class HourlyCordonDirectionCount(CordonDirectionCount):
         self.write_csv(benchmark_df, csv_path, write_path=write_path)
 
         # Calc score
-        return sum(np.absolute(results_array - counts_array)) / counts_array.sum()
+        return np.absolute(results_array - counts_array).sum() / counts_array.sum()
 
 
 class PeriodCordonDirectionCount(CordonDirectionCount):
@@ -2042,16 +2045,7 @@ class PeriodCordonDirectionCount(CordonDirectionCount):
         """
 
         # collect all results
-        assert len(result_df), f"zero length results df at {self.cordon_name}."
-
-        for link_id in self.link_ids:
-            if link_id not in result_df.index:
-                self.logger.warning("Zero filling results for benchmark")
-                result_df.loc[link_id] = 0
-
-        model_results = result_df.loc[result_df.index.isin(
-            self.link_ids), :].copy()
-        model_results.loc[:, 'mode'] = self.mode
+        model_results = self.get_model_results(result_df)
 
         # write cordon model results
         csv_name = '{}_{}_model_results.csv'.format(
@@ -2063,12 +2057,10 @@ class PeriodCordonDirectionCount(CordonDirectionCount):
         classes_df = model_results.groupby('subpopulation').sum()
 
         # filter model results for hours
-        select_cols = [str(i) for i in self.hours]
-        classes_df = classes_df.loc[:, select_cols]
+        classes_df = classes_df.loc[:, self.select_cols]
 
         # Build total result for scoring
         result = classes_df.values.sum()
-        result_df = self.count_to_df(result, 'model')
 
         # Label and write csv with counts by subpopulation
         classes_df.loc[:, 'source'] = 'model'
@@ -2078,10 +2070,12 @@ class PeriodCordonDirectionCount(CordonDirectionCount):
 
         # Get cordon count for mode
         count = self.get_count(self.counts_df)
-        count_df = self.count_to_df(count, 'benchmark')
 
         # Label and write benchmark csv
-        benchmark_df = pd.concat([count_df, result_df]).groupby('source').sum()
+        benchmark_df = pd.DataFrame(
+            {'counts': [count, result]},
+            index=pd.Index(['benchmark', 'model'], name='source')
+        )
         csv_name = '{}_{}_benchmark.csv'.format(
             self.cordon_name, self.direction)
         csv_path = os.path.join('benchmarks', csv_name)
@@ -2245,32 +2239,43 @@ class BenchmarkWorkStation(WorkStation):
         "test_town_peak_cordon": TestTownPeakIn,
     }
 
-    benchmarks = {}
-    scores_df = None
-    meta_score = 0
-
     def __init__(self, config):
         super().__init__(config)
         self.logger = logging.getLogger(__name__)
 
+        self.flat_summary = []
+        self.meta_score = 0
+
         # Create output folder if it does not exist
         benchmark_dir = os.path.join(self.config.output_path, 'benchmarks')
         if not os.path.exists(benchmark_dir):
             os.makedirs(benchmark_dir)
 
-    def build(self, spinner=None, write_path=None) -> None:
+    @property
+    def scores_df(self):
+        """
+        Benchmark scores as a DataFrame of benchmark, type and score, built on request.
+        """
+        return pd.DataFrame(self.flat_summary, columns=['benchmark', 'type', 'score'])
+
+    def build(self, write_path=None, write=True) -> None:
         """
         Calculates all sub scores from benchmarks, writes to disk and returns
         combined metascore.
+        :param write: bool, write score summaries to disk, defaults to True
         """
         summary = {}
         flat_summary = []
+        self.flat_summary = flat_summary
+        self.meta_score = 0
 
         self.logger.info('--BENCHMARK SCORES--')
 
+        all_scores = self.build_benchmarks(write_path=write_path)
+
         for benchmark_name, benchmark in self.resources.items():
 
-            scores = benchmark.build({}, write_path=write_path)
+            scores = all_scores[benchmark_name]
             weight = benchmark.weight
 
             sub_summary = {'scores': scores,
@@ -2286,19 +2291,56 @@ class BenchmarkWorkStation(WorkStation):
 
         self.logger.info(f' *** Meta Score = {self.meta_score} ***')
 
+        summary['meta_score'] = self.meta_score
+
+        if not write:
+            return None
+
         # Write scores
         csv_name = 'benchmark_scores.csv'
-
-        self.scores_df = pd.DataFrame(
-            flat_summary, columns=['benchmark', 'type', 'score'])
         csv_path = os.path.join('benchmarks', csv_name)
         self.write_csv(self.scores_df, csv_path, write_path=write_path)
 
-        summary['meta_score'] = self.meta_score
         json_name = 'benchmark_scores.json'
         json_path = os.path.join('benchmarks', json_name)
         self.write_json(summary, json_path, write_path=write_path)
 
+    def build_benchmarks(self, write_path=None) -> dict:
+        """
+        Build each benchmark and return their scores keyed by benchmark name. Benchmarks are
+        independent of each other so are built in a pool of worker processes if more than one
+        worker is configured. Processes rather than threads are used because the benchmarks
+        plot with pyplot, which is not thread safe.
+        :param write_path: Optional output path overwrite
+        :return: dict of {benchmark name: scores dict}
+        """
+        workers = min(self.config.benchmark_workers, len(self.resources))
+
+        if workers <= 1:
+            return {
+                benchmark_name: benchmark.build({}, write_path=write_path)
+                for benchmark_name, benchmark in self.resources.items()
+            }
+
+        self.logger.info(f'Building {len(self.resources)} benchmarks with {workers} workers')
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            futures = {
+                benchmark_name: executor.submit(build_benchmark, benchmark, write_path)
+                for benchmark_name, benchmark in self.resources.items()
+            }
+            return {benchmark_name: future.result() for benchmark_name, future in futures.items()}
+
+
+def build_benchmark(benchmark, write_path=None):
+    """
+    Build a single benchmark and return its scores. Module level so that it can be sent to a
+    worker process.
+    :param benchmark: BenchmarkTool
+    :param write_path: Optional output path overwrite
+    :return: dict of scores
+    """
+    return benchmark.build({}, write_path=write_path)
+
 
 def merge_summary_stats(bm_results_summary):
 
@@ -128,6 +128,22 @@ you may either or both the keys using HANDLER--NAME, for example:
         trip_modes--subpopulations = {groupby_person_attributes=["subpopulation"]}
 """
             )
+        # toml loads inline tables as dicts of a locally defined class, which cannot be pickled
+        # (as required to build benchmarks in worker processes), so settings are kept as plain dicts
+        self.settings = self.plain_settings(self.settings)
+
+    @staticmethod
+    def plain_settings(settings):
+        """
+        Return a copy of settings with all nested mappings converted to plain dicts.
+        :param settings: settings dict, list or value
+        :return: settings dict, list or value
+        """
+        if isinstance(settings, dict):
+            return {key: Config.plain_settings(value) for key, value in settings.items()}
+        if isinstance(settings, list):
+            return [Config.plain_settings(value) for value in settings]
+        return settings
 
     def load_required_settings(self):
 
@@ -181,6 +197,18 @@ you may either or both the keys using HANDLER--NAME, for example:
             self.settings["scenario"]["crs"]
         )
 
+    @property
+    def output_format(self):
+        return self.valid_output_format(
+            self.settings["outputs"].get("format", "csv")
+        )
+
+    @property
+    def benchmark_workers(self):
+        return self.valid_workers(
+            self.settings["scenario"].get("benchmark_workers", 1)
+        )
+
     @property
     def inputs_directory(self):
         inputs_path = self.settings["inputs"].get("inputs_directory")
@@ -320,6 +348,32 @@ you may either or both the keys using HANDLER--NAME, for example:
             )
         return int(inp)
 
+    @staticmethod
+    def valid_output_format(inp):
+        """
+        Raise exception if specified output format is not csv or parquet.
+        :param inp: Output format
+        :return: Output format (lower case str)
+        """
+        if str(inp).lower() not in ["csv", "parquet"]:
+            raise ConfigError(
+                f"Configured output format ({inp}) not valid (please use 'csv' (default) or 'parquet')"
+            )
+        return str(inp).lower()
+
+    @staticmethod
+    def valid_workers(inp):
+        """
+        Raise exception if specified number of workers is not a positive integer.
+        :param inp: Number of workers
+        :return: Number of workers (int)
+        """
+        if isinstance(inp, bool) or not isinstance(inp, int) or inp < 1:
+            raise ConfigError(
+                f"Configured workers ({inp}) not valid (please use a positive integer)"
+            )
+        return inp
+
     @staticmethod
     def valid_path(path, field_name):
         """
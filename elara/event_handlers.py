@@ -1,6 +1,5 @@
 import logging
 import os
-from math import floor
 from typing import Optional, Tuple, Union
 
 import geopandas as gpd
@@ -1944,7 +1943,8 @@ modes. Elara will continue with all stops found in schedule.
 
                 if prev_stop_id is not None:
                     time = float(elem.get("time"))
-                    hour = floor(time / (86400.0 / self.config.time_periods)) % self.config.time_periods
+                    periods = self.config.time_periods
+                    hour = int(time * periods // 86400) % periods
                     occupancy_dict = self.veh_occupancy.get(veh_id, {})
 
                     for attribute_class, occupancy in occupancy_dict.items():
@@ -2613,7 +2613,7 @@ def table_position(elem_indices, class_indices, periods, elem_id, attribute_clas
     """
     x = elem_indices[elem_id]
     y = class_indices[attribute_class]
-    z = floor(time / (86400.0 / periods)) % periods
+    z = int(time * periods // 86400) % periods
     return x, y, z
 
 
@@ -2636,7 +2636,7 @@ def table_position_4d(origin_elem_indices, destination_elem_indices, class_indic
     o = origin_elem_indices[o_id]
     d = destination_elem_indices[d_id]
     y = class_indices[attribute_class]
-    z = floor(time / (86400.0 / periods)) % periods
+    z = int(time * periods // 86400) % periods
     return o, d, y, z
 
 
@@ -2,9 +2,16 @@ from typing import Dict, List, Union, Optional
 import pandas as pd
 import geopandas as gpd
 import pyarrow as pa
+import pyarrow.parquet as pq
 import os
+import io
+import bz2
+import gzip
+import lzma
+import zipfile
 import json
 import logging
+from collections import defaultdict, deque
 from matplotlib.figure import Figure
 import warnings
 with warnings.catch_warnings():
@@ -13,6 +20,9 @@ with warnings.catch_warnings():
 
 from elara.helpers import camel_to_snake
 
+# lines held by chunk writers before each write, large enough to amortise pandas frame building
+CHUNKSIZE = 2 ** 16
+
 
 class Tool:
     """
@@ -40,8 +50,6 @@ class Tool:
     valid_modes = None
     invalid_modes = None
 
-    resources = {}
-
     def __init__(
             self, config,
             mode: Union[None, str] = 'all',
@@ -56,6 +64,7 @@ class Tool:
         :param compression: compression used for output (csv) files. Can be one of: 'infer', 'gzip', 'zip', 'bz2', 'zstd', None
         """
         self.config = config
+        self.resources = {}
         self.mode = self._validate_mode(mode)
         self.groupby_person_attribute = groupby_person_attribute
         self.compression = self._validate_compression_method(compression)
@@ -170,10 +179,12 @@ class Tool:
                 f'Unsupported compression method: {compression} at tool: {self}')
         return compression
 
-    def start_csv_chunk_writer(self, csv_name: str, write_path=None, compression=None):
+    def start_csv_chunk_writer(
+            self, csv_name: str, write_path=None, compression=None, chunksize=CHUNKSIZE, columns=None
+    ):
         """
         Return a simple csv ChunkWriter, default to config path if write_path (used for testing)
-        not given.
+        not given. Optionally declare the columns of the lines to be written.
         """
         if write_path:
             path = os.path.join(write_path, csv_name)
@@ -183,7 +194,7 @@ class Tool:
         if compression is not None:
             path = path_compressed(path, compression)
 
-        return CSVChunkWriter(path, compression)
+        return CSVChunkWriter(path, compression, chunksize=chunksize, columns=columns)
 
     def start_arrow_chunk_writer(self, file_name: str, write_path=None):
         """
@@ -197,6 +208,34 @@ class Tool:
 
         return ArrowChunkWriter(path)
 
+    def start_parquet_chunk_writer(
+            self, file_name: str, write_path=None, chunksize=CHUNKSIZE, columns=None, dtypes=None
+    ):
+        """
+        Return a simple parquet ChunkWriter, default to config path if write_path (used for testing)
+        not given. Optionally declare the columns and column dtypes of the lines to be written.
+        """
+        if write_path:
+            path = os.path.join(write_path, file_name)
+        else:
+            path = os.path.join(self.config.output_path, file_name)
+
+        return ParquetChunkWriter(path, chunksize=chunksize, columns=columns, dtypes=dtypes)
+
+    def start_log_chunk_writer(self, name: str, write_path=None, columns=None, dtypes=None):
+        """
+        Return a ChunkWriter for a log output named name, writing parquet if configured
+        (config.output_format), otherwise csv (compressed as per tool compression option).
+        Column dtypes are only required by parquet, which fixes its schema with the first chunk.
+        """
+        if self.config.output_format == "parquet":
+            return self.start_parquet_chunk_writer(
+                f"{name}.parquet", write_path=write_path, columns=columns, dtypes=dtypes
+            )
+        return self.start_csv_chunk_writer(
+            f"{name}.csv", write_path=write_path, compression=self.compression, columns=columns
+        )
+
     def write_csv(
             self,
             write_object: Union[pd.DataFrame, gpd.GeoDataFrame],
@@ -472,6 +511,9 @@ class WorkStation:
         :return: None
         """
 
+        if not self.requirements:
+            return None
+
         # gather supplier tools
         supplier_tools = {}
         if self.suppliers:
@@ -481,10 +523,10 @@ class WorkStation:
                 supplier_tools.update(supplier.tools)
 
         # clean requirments
-        clean_requirements = [r.split("--")[0] for r in self.requirements]
+        clean_requirements = {r.split("--")[0] for r in self.requirements}
 
         # check for missing requirements
-        missing = set(clean_requirements) - set(supplier_tools)
+        missing = clean_requirements - supplier_tools.keys()
         if missing:
             helpful_error_string = self.build_helpful_error_string(missing)
             raise ValueError(
@@ -668,16 +710,25 @@ class WorkStation:
 class CSVChunkWriter:
     """
     Extend a list of lines (dicts) that are saved to drive once they reach a certain length.
+    A single buffered file handle is opened with the first write and kept open until .finish(),
+    so that chunks are streamed to the same file rather than re-opening (and re-compressing) it
+    for every write.
+    If chunksize is None, all lines are held in memory and written once at .finish().
+    If columns are given, lines are assumed to share these keys, saving pandas from collecting
+    the keys of every line when building each chunk.
     """
 
-    def __init__(self, path, compression=None, chunksize=1000) -> None:
+    def __init__(self, path, compression=None, chunksize=CHUNKSIZE, columns=None) -> None:
         self.path = path
         self.compression = compression
         self.chunksize = chunksize
+        self.columns = columns
 
         self.chunk = []
         self.idx = 0
 
+        self._fh = None
+
         self.logger = logging.getLogger(__name__)
         self.logger.debug(
             f'Chunkwriter initiated for {path}, with size {chunksize} lines')
@@ -690,7 +741,7 @@ class CSVChunkWriter:
         :return: None
         """
         self.chunk.extend(lines)
-        if len(self.chunk) > self.chunksize:
+        if self.chunksize is not None and len(self.chunk) > self.chunksize:
             self.write()
 
     def write(self) -> None:
@@ -698,20 +749,19 @@ class CSVChunkWriter:
         Convert chunk to dataframe and write to disk.
         :return: None
         """
+        if self._fh is None:
+            self._fh = open_text_writer(self.path, self.compression)
         chunk_df = pd.DataFrame(self.chunk, index=range(
-            self.idx, self.idx + len(self.chunk)))
-        if not self.idx:
-            chunk_df.to_csv(self.path, compression=self.compression)
-            self.idx += len(self.chunk)
-        else:
-            chunk_df.to_csv(self.path, header=None, mode="a",
-                            compression=self.compression)
-            self.idx += len(self.chunk)
+            self.idx, self.idx + len(self.chunk)), columns=self.columns)
+        # header is only written with the first chunk
+        chunk_df.to_csv(self._fh, header=not self.idx)
+        self.idx += len(self.chunk)
         del chunk_df
         self.chunk = []
 
     def finish(self) -> None:
         self.write()
+        self._fh.close()
         self.logger.info(f'Chunkwriter finished for {self.path}')
 
     def __len__(self):
@@ -723,7 +773,7 @@ class ArrowChunkWriter:
     Extend a list of lines (dicts) that are saved to drive once they reach a certain length.
     """
 
-    def __init__(self, path, chunksize=1000) -> None:
+    def __init__(self, path, chunksize=CHUNKSIZE) -> None:
         self.path = path
         self.chunksize = chunksize
         self.writer = None
@@ -743,7 +793,7 @@ class ArrowChunkWriter:
         :return: None
         """
         self.chunk.extend(lines)
-        if len(self.chunk) >= self.chunksize:
+        if self.chunksize is not None and len(self.chunk) >= self.chunksize:
             self.write()
 
     def write(self) -> None:
@@ -772,6 +822,109 @@ class ArrowChunkWriter:
         return self.idx + len(self.chunk)
 
 
+class ParquetChunkWriter:
+    """
+    Extend a list of lines (dicts) that are saved to drive once they reach a certain length.
+    Each chunk is written as a parquet row group, using the schema of the first chunk.
+    If chunksize is None, all lines are held in memory and written once at .finish().
+    If columns are given, lines are assumed to share these keys, and an empty file with these
+    columns is written if no lines are added.
+    If dtypes (a column to dtype mapping) are given, every chunk is cast to them, so that columns
+    whose type can vary between chunks (such as ints and floats, or values that may be missing
+    from the whole first chunk) share a schema. Undeclared columns that are empty in the first
+    chunk are assumed to be strings. Timedelta columns are written as strings, as in csv logs,
+    because parquet has no duration type.
+    """
+
+    def __init__(self, path, chunksize=CHUNKSIZE, columns=None, dtypes=None) -> None:
+        self.path = path
+        self.chunksize = chunksize
+        self.columns = columns
+        self.dtypes = dtypes
+        self.writer = None
+
+        self.chunk = []
+        self.idx = 0
+
+        self.logger = logging.getLogger(__name__)
+        self.logger.debug(
+            f'Chunkwriter initiated for {path}, with size {chunksize} lines')
+
+    def add(self, lines: list) -> None:
+        """
+        Add a list of lines (dicts) to the chunk.
+        If chunk exceeds chunksize, then write to disk.
+        :param lines: list of dicts
+        :return: None
+        """
+        self.chunk.extend(lines)
+        if self.chunksize is not None and len(self.chunk) > self.chunksize:
+            self.write()
+
+    def write(self) -> None:
+        """
+        Convert chunk to table and write to parquet.
+        :return: None
+        """
+        if not self.chunk:
+            return None
+        table = self.to_table(self.chunk)
+        if self.writer is None:
+            self.open_writer(table)
+        if not table.schema.equals(self.writer.schema):
+            table = table.cast(self.writer.schema)
+        self.writer.write_table(table)
+        self.idx += len(self.chunk)
+        del table
+        self.chunk = []
+
+    def to_table(self, lines: list) -> pa.Table:
+        """
+        Convert lines (dicts) to an arrow table, cast to any declared dtypes.
+        :param lines: list of dicts
+        :return: pa.Table
+        """
+        chunk_df = pd.DataFrame(lines, columns=self.columns)
+        if self.dtypes:
+            chunk_df = chunk_df.astype(self.dtypes)
+        for column in chunk_df.select_dtypes("timedelta").columns:
+            values = chunk_df[column]
+            chunk_df[column] = values.astype(str).where(values.notna(), None)
+        return pa.Table.from_pandas(chunk_df, preserve_index=False)
+
+    def open_writer(self, table: pa.Table) -> None:
+        """
+        Open the parquet writer with the schema of the given (first) table.
+        :param table: pa.Table
+        :return: None
+        """
+        fields = []
+        for field in table.schema:
+            if pa.types.is_null(field.type):
+                if not self.dtypes or field.name not in self.dtypes:
+                    self.logger.warning(
+                        f'{self.path} column {field.name} is empty in the first chunk and has no '
+                        f'declared dtype, it is assumed to be a string column'
+                    )
+                field = field.with_type(pa.string())
+            fields.append(field)
+        self.writer = pq.ParquetWriter(
+            self.path, pa.schema(fields, metadata=table.schema.metadata)
+        )
+
+    def finish(self) -> None:
+        self.write()
+        if self.writer is None and self.columns is not None:
+            # no lines were added, write the declared columns only
+            self.open_writer(self.to_table([]))
+        if self.writer is not None:
+            self.writer.close()
+        self.logger.info(f'Chunkwriter finished for {self.path}')
+
+    def __len__(self):
+        return self.idx + len(self.chunk)
+
+
 def build(start_node: WorkStation, write_path=None) -> list:
     """
     Main function for validating graph requirements, then initiating and building minimum resources.
@@ -810,12 +963,14 @@ def assemble_dag(start_node: WorkStation) -> None:
     logger = logging.getLogger(__name__)
     logger.debug(f'Starting DAG')
 
-    if is_cyclic(start_node):
+    cyclic = is_cyclic(start_node)
+    if cyclic:
         raise UserWarning(
-            f"Cyclic dependency found at {is_cyclic(start_node)}")
-    if is_broken(start_node):
+            f"Cyclic dependency found at {cyclic}")
+    broken = is_broken(start_node)
+    if broken:
         raise UserWarning(
-            f"Broken dependency found at {is_broken(start_node)}")
+            f"Broken dependency found at {broken}")
 
     build_graph_depth(start_node)
 
@@ -830,21 +985,24 @@ def initiate_dag(start_node: WorkStation) -> list:
     logger.debug(f'Initiating DAG')
 
     queue = list()
-    to_visit = list()
+    queued = set()
+    to_visit = deque()
     to_visit.append(start_node)
     queue.append(start_node)
+    queued.add(start_node)
 
     while to_visit:
-        current = to_visit.pop(0)
+        current = to_visit.popleft()
         current.engage()
 
         if current.suppliers:
             current.validate_suppliers()
 
             for supplier in order_by_distance(current.suppliers):
-                if supplier not in queue:
+                if supplier not in queued:
                     to_visit.append(supplier)
                     queue.append(supplier)
+                    queued.add(supplier)
 
     logger.info(f'All Workstations Initiated and Validated')
     return queue
@@ -854,10 +1012,8 @@ def build_dag(queue, write_path=None) -> list:
     # stage 3:
     logger = logging.getLogger(__name__)
     logger.info(f'Initiating Build')
-    return_queue = queue[::-1]
     visited = []
-    while return_queue:
-        current = return_queue.pop(0)
+    for current in reversed(queue):
         current.build(write_path=write_path)
         visited.append(current)
 
@@ -869,10 +1025,8 @@ def dry_build_dag(queue, write_path=None) -> list:
     # stage 3:
     logger = logging.getLogger(__name__)
     logger.info(f'Initiating Build')
-    return_queue = queue[::-1]
     visited = []
-    while return_queue:
-        current = return_queue.pop(0)
+    for current in reversed(queue):
         current.dry_build(write_path=write_path)
         visited.append(current)
 
@@ -883,58 +1037,70 @@ def dry_build_dag(queue, write_path=None) -> list:
 def is_cyclic(start):
     """
     Return WorkStation if the directed graph starting at WorkStation has a cycle.
+    Iterative depth-first search, the returned WorkStation is the start's supplier on the path
+    to the cycle.
     :param start: starting WorkStation
     :return: WorkStation
     """
-    path = set()
-    visited = set()
-
-    def visit(vertex):
-        if vertex in visited:
-            return False
-        visited.add(vertex)
-        path.add(vertex)
-        if vertex.suppliers:
-            for supplier in vertex.suppliers:
-                if supplier in path or visit(supplier):
-                    return supplier
-        path.remove(vertex)
+    path = {start}
+    visited = {start}
+    stack = [(start, iter(start.suppliers or []))]
 
-    return visit(start)
+    while stack:
+        vertex, suppliers = stack[-1]
+        for supplier in suppliers:
+            if supplier in path:
+                # report the first-level supplier leading to the cycle
+                return stack[1][0] if len(stack) > 1 else supplier
+            if supplier not in visited:
+                visited.add(supplier)
+                path.add(supplier)
+                stack.append((supplier, iter(supplier.suppliers or [])))
+                break
+        else:
+            # all suppliers explored
+            stack.pop()
+            path.remove(vertex)
 
 
 def is_broken(start):
     """
     Return WorkStation if directed graph starting at WorkStation has broken connection,
     ie a supplier who does not have the correct manager in .managers.
+    Iterative depth-first search, the returned WorkStation is the start's supplier on the path
+    to the broken connection.
     :param start: starting WorkStation
     :return: WorkStation
     """
 
-    visited = set()
-
     def broken_link(manager, supplier):
         if not supplier.managers:
             return True
         if manager not in supplier.managers:
             return True
 
-    def visit(vertex):
-        visited.add(vertex)
-        if vertex.suppliers:
-
-            for supplier in vertex.suppliers:
-                if supplier in visited:
-                    continue
-                if broken_link(vertex, supplier) or visit(supplier):
-                    return supplier
+    visited = {start}
+    stack = [(start, iter(start.suppliers or []))]
 
-    return visit(start)
+    while stack:
+        vertex, suppliers = stack[-1]
+        for supplier in suppliers:
+            if supplier in visited:
+                continue
+            if broken_link(vertex, supplier):
+                # report the first-level supplier leading to the broken link
+                return stack[1][0] if len(stack) > 1 else supplier
+            visited.add(supplier)
+            stack.append((supplier, iter(supplier.suppliers or [])))
+            break
+        else:
+            # all suppliers explored
+            stack.pop()
 
 
 def build_graph_depth(node: WorkStation, visited=None, depth=0) -> list:
     """
-    Function to recursive depth-first traverse graph of suppliers, recording workstation depth in
+    Function to iteratively depth-first traverse graph of suppliers, recording workstation depth in
     graph.
     :param node: starting workstation
     :param visited: list, visited workstations
@@ -943,15 +1109,20 @@ def build_graph_depth(node: WorkStation, visited=None, depth=0) -> list:
     """
     if not visited:
         visited = []
-    visited.append(node)
 
-    # Recur for all the nodes supplying this node
-    if node.suppliers:
-        depth = depth + 1
-        for supplier in node.suppliers:
-            if supplier.depth < depth:
-                supplier.depth = depth
-            build_graph_depth(supplier, visited, depth)
+    stack = [(node, depth)]
+    while stack:
+        current, current_depth = stack.pop()
+        visited.append(current)
+
+        # push all the nodes supplying this node
+        if current.suppliers:
+            supplier_depth = current_depth + 1
+            for supplier in current.suppliers:
+                if supplier.depth < supplier_depth:
+                    supplier.depth = supplier_depth
+            # reversed so that suppliers are visited in order
+            stack.extend((supplier, supplier_depth) for supplier in reversed(current.suppliers))
 
     return visited
 
@@ -963,17 +1134,19 @@ def display_graph(node: WorkStation) -> None:
     :return: None
     """
 
-    visited = set()
-
-    def visit(vertex):
-        vertex.display_string()
-        visited.add(vertex)
-        if vertex.suppliers:
-            for supplier in vertex.suppliers:
-                if supplier not in visited:
-                    visit(supplier)
-
-    visit(node)
+    node.display_string()
+    visited = {node}
+    stack = [iter(node.suppliers or [])]
+
+    while stack:
+        for supplier in stack[-1]:
+            if supplier not in visited:
+                supplier.display_string()
+                visited.add(supplier)
+                stack.append(iter(supplier.suppliers or []))
+                break
+        else:
+            stack.pop()
 
 
 def order_by_distance(candidates: list) -> list:
@@ -986,48 +1159,43 @@ def order_by_distance(candidates: list) -> list:
 
 
 def complex_combine_reqs(reqs: List[dict]) -> Dict[str, list]:
+    """
+    Helper function for combining lists of requirements (dicts of options) into a single
+    requirements dict, in a single pass over all requirements. Modes and groupby person
+    attributes are combined as sets (defaulting to {None}), other arguments are merged.
+    :param reqs: list of dicts of options
+    :return: dict, of requirements
+    """
 
     if not reqs:
         return {}
 
-    tool_set = set()
-    for req in reqs:
-        if req:
-            tool_set |= set(req)
-
     combined_reqs = {}
-    for tool in tool_set:
-        combined_reqs[tool] = {}
-        # collect unique mode dependencies
-        modes = set()
-        groupby_person_attributes = set()
-        kwargs = {}
-        for req in reqs:
-            if req and req.get(tool):
-                combined_reqs[tool] = req.get(tool)
-
-            if req is None:
-                req = {}
-
-            tool_reqs = req.get(tool, {})
+    modes = defaultdict(set)
+    groupby_person_attributes = defaultdict(set)
+    kwargs = defaultdict(dict)
+
+    for req in reqs:
+        if not req:
+            continue
+        for tool, tool_reqs in req.items():
+            combined_reqs.setdefault(tool, {})
             if not tool_reqs:
-                tool_reqs = {}  # TODO bit hacky, better to get handlers without requirments to return {}
+                continue  # TODO bit hacky, better to get handlers without requirments to return {}
+            combined_reqs[tool] = tool_reqs
             if tool_reqs.get("modes"):
-                modes |= set(tool_reqs.get("modes"))
+                modes[tool] |= set(tool_reqs.get("modes"))
             if tool_reqs.get("groupby_person_attributes"):
-                groupby_person_attributes |= set(
+                groupby_person_attributes[tool] |= set(
                     tool_reqs.get("groupby_person_attributes"))
-            remaining_args = {k: v for k, v in tool_reqs.items(
-            ) if k not in ["modes", "groupby_person_attributes"]}
-            kwargs.update(remaining_args)
-
-        if not modes:
-            modes = {None}
-        if not groupby_person_attributes:
-            groupby_person_attributes = {None}
-        combined_reqs[tool]['modes'] = modes
-        combined_reqs[tool]['groupby_person_attributes'] = groupby_person_attributes
-        combined_reqs[tool].update(kwargs)
+            kwargs[tool].update(
+                {k: v for k, v in tool_reqs.items() if k not in ["modes", "groupby_person_attributes"]}
+            )
+
+    for tool, options in combined_reqs.items():
+        options['modes'] = modes.get(tool) or {None}
+        options['groupby_person_attributes'] = groupby_person_attributes.get(tool) or {None}
+        options.update(kwargs.get(tool, {}))
 
     return combined_reqs
 
@@ -1047,28 +1215,25 @@ def combine_reqs(reqs: List[dict]) -> Dict[str, list]:
     """
     if not reqs:
         return {}
-    tool_set = set()
-    for req in reqs:
-        if req:
-            tool_set.update(list(req))
+
     combined_reqs = {}
-    for tool in tool_set:
-        combined_reqs[tool] = {}
-        if tool_set:
-            # collect unique mode dependencies
-            modes = set()
-            for req in reqs:
-                if req and req.get(tool):
-                    modes.update(req[tool]['modes'])
-
-            if modes:
-                for req in reqs:
-                    # keep all arguments of current (in the loop) tool, but only pass "modes" argument to dependencies
-                    if req and req.get(tool):
-                        combined_reqs[tool] = req.get(tool)
-                combined_reqs[tool]['modes'] = modes
-            else:
-                combined_reqs[tool] = None
+    modes = defaultdict(set)
+    for req in reqs:
+        if not req:
+            continue
+        for tool, options in req.items():
+            combined_reqs.setdefault(tool, None)
+            if options:
+                # collect unique mode dependencies
+                modes[tool].update(options['modes'])
+                # keep all arguments of latest tool options, but only pass "modes" argument to dependencies
+                combined_reqs[tool] = options
+
+    for tool, options in combined_reqs.items():
+        if modes.get(tool):
+            options['modes'] = modes[tool]
+        else:
+            combined_reqs[tool] = None
 
     return combined_reqs
 
@@ -1149,5 +1314,46 @@ def path_compressed(path: str, compression: str) -> str:
     return path
 
 
+class _ZipMemberWriter(io.TextIOWrapper):
+    """
+    Text writer for a single member of a zip archive, closing the archive along with the member.
+    """
+
+    def __init__(self, archive: zipfile.ZipFile, name: str, **kwargs) -> None:
+        self._archive = archive
+        super().__init__(archive.open(name, "w"), **kwargs)
+
+    def close(self) -> None:
+        super().close()
+        self._archive.close()
+
+
+def open_text_writer(path: str, compression: Optional[str] = None, buffering: int = 2**20):
+    """
+    Open a text file handle for writing, compressed with the given method.
+    Zip archives contain a single member named after the path without the '.zip' suffix,
+    consistent with pandas.
+    :param path: output filepath
+    :param compression: Compression type, one of None, 'bz2', 'gzip', 'xz', 'zip'
+    :param buffering: buffer size (bytes) for uncompressed files
+    :return: writable text file handle
+    """
+    if compression is None:
+        return open(path, "w", buffering=buffering, encoding="utf-8", newline="")
+    if compression == 'gzip':
+        return gzip.open(path, "wt", encoding="utf-8", newline="")
+    if compression == 'bz2':
+        return bz2.open(path, "wt", encoding="utf-8", newline="")
+    if compression == 'xz':
+        return lzma.open(path, "wt", encoding="utf-8", newline="")
+    if compression == 'zip':
+        name = os.path.basename(path)
+        if name.endswith(".zip"):
+            name = name[:-len(".zip")]
+        archive = zipfile.ZipFile(path, "w", compression=zipfile.ZIP_DEFLATED)
+        return _ZipMemberWriter(archive, name, encoding="utf-8", newline="")
+    raise ValueError(f'Unsupported compression method: {compression}')
+
+
 def get_closest(target, choices, limit=3, score=75) -> list:
     return [f[0] for f in process.extract(target, choices, limit=limit) if f[1] > score]
@@ -1,3 +1,4 @@
+import os
 from pathlib import Path
 import click
 import polyline
@@ -56,3 +57,26 @@ def try_sort_on_numeric_index(df: pd.DataFrame):
     df["sorter"] = index
     df.sort_values("sorter", inplace=True)
     df.drop("sorter", inplace=True, axis=1)
+
+
+def read_log(csv_path, output_format="csv", index_col=None, columns=None):
+    """
+    Read a log output (eg trip logs) written in the given output format. Parquet logs are read
+    from the same path with a '.parquet' suffix rather than '.csv'. Parquet logs hold values as
+    they were logged, so numbers held as strings (such as coordinates) are converted as they would
+    be when reading csv. Parquet logs have no written index column.
+    :param csv_path: str, path to csv log
+    :param output_format: str, log output format, 'csv' or 'parquet' (see config.output_format)
+    :param index_col: Optional, column name(s) to use as index (or 0 for the written csv index)
+    :param columns: Optional, list of column names to read, including any index columns
+    :return: DataFrame
+    """
+    if output_format != "parquet":
+        return pd.read_csv(csv_path, index_col=index_col, usecols=columns)
+
+    df = pd.read_parquet(os.path.splitext(csv_path)[0] + ".parquet", columns=columns)
+    for column in df.columns[df.dtypes == object]:
+        df[column] = pd.to_numeric(df[column], errors="ignore")
+    if index_col is not None and not isinstance(index_col, int):
+        df = df.set_index(index_col)
+    return df
@@ -4,7 +4,6 @@ import pandas as pd
 import pyproj
 from shapely.geometry import Point, LineString
 import gzip
-from io import BytesIO
 from math import floor
 from typing import Optional
 import logging
@@ -664,9 +663,9 @@ class InputPlans(Plans):
 class OutputConfig(InputTool):
     requirements = ['output_config_path']
 
-    modes = set()
-    activities = set()
-    sub_populations = set()
+    modes = None
+    activities = None
+    sub_populations = None
 
     def build(self, resources: dict, write_path: Optional[str] = None):
         """
@@ -679,24 +678,27 @@ class OutputConfig(InputTool):
         path = str(resources['output_config_path'].path)
         elems = etree.parse(path)
 
+        modes = set()
         for e in elems.xpath(
                 '//module/parameterset/parameterset/param[@name="mode"]'
         ):
-            self.modes.add(e.get('value'))
+            modes.add(e.get('value'))
 
+        activities = set()
         for e in elems.xpath(
                 '//module/parameterset/parameterset/param[@name="activityType"]'
         ):
-            self.activities.add(e.get('value'))
+            activities.add(e.get('value'))
 
+        sub_populations = set()
         for e in elems.xpath(
                 '//module/parameterset/param[@name="subpopulation"]'
         ):
-            self.sub_populations.add(e.get('value'))
+            sub_populations.add(e.get('value'))
 
-        self.modes = list(self.modes | set(["transit_walk", "pt"]))
-        self.activities = list(self.activities)
-        self.sub_populations = list(self.sub_populations)
+        self.modes = list(modes | set(["transit_walk", "pt"]))
+        self.activities = list(activities)
+        self.sub_populations = list(sub_populations)
 
 
 class ModeHierarchy(InputTool):
@@ -888,6 +890,8 @@ def get_elems(path, tag):
     """
     target = try_unzip(path)
     tag = get_tag(target, tag)
+    if not isinstance(target, str):
+        target.close()
     target = try_unzip(path)  # need to repeat :(
     return parse_elems(target, tag)
 
@@ -895,7 +899,9 @@ def get_elems(path, tag):
 def parse_elems(target, tag):
     """
     Traverse the given XML tree, retrieving the elements of the specified tag.
-    :param target: Target xml, either BytesIO object or string path
+    Each element is cleared once consumed, along with any preceding siblings, so that memory
+    use stays bounded while streaming large files.
+    :param target: Target xml, either gzip file object or string path
     :param tag: The tag type to extract , e.g. 'link'
     :return: Generator of elements
     """
@@ -903,23 +909,30 @@ def parse_elems(target, tag):
     for _, element in doc:
         yield element
         element.clear()
-        del element.getparent()[0]
+        while element.getprevious() is not None:
+            del element.getparent()[0]
     del doc
+    if not isinstance(target, str):
+        target.close()
 
 
 def try_unzip(path):
     """
-    Attempts to unzip xml at given path, if fails, returns path
+    Attempts to open xml at given path as gzip, streaming it rather than reading the whole
+    unzipped file into memory, if fails, returns path
     :param path: xml path string
-    :return: either BytesIO object or string path
+    :return: either gzip file object or string path
     """
     try:
-        with gzip.open(path) as unzipped:
-            xml = unzipped.read()
-            target = BytesIO(xml)
-            return target
+        unzipped = gzip.open(path)
+    except OSError:
+        return path
+    try:
+        unzipped.peek(1)
     except OSError:
+        unzipped.close()
         return path
+    return unzipped
 
 
 def get_tag(target, tag):
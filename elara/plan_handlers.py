@@ -1,10 +1,10 @@
 import numpy as np
-from math import floor
 import pandas as pd
 from datetime import datetime, timedelta
 from typing import Optional
 import logging
 import json
+from sys import intern
 
 from elara.factory import Tool, WorkStation
 
@@ -43,7 +43,7 @@ class PlanHandlerTool(Tool):
         """
         Extract mode and route identifieers from a MATSim v11 route xml element.
         """
-        route = route_elem.text.split("===")[-2]
+        route = route_elem.text.rsplit("===", 2)[-2]
         mode = self.resources["transit_schedule"].route_to_mode_map.get(route)
         return mode
 
@@ -55,11 +55,27 @@ class PlanHandlerTool(Tool):
         route = route_dict["transitRouteId"]
         return route
 
+    @staticmethod
+    def selected_plans(elem):
+        """
+        Return the plans of a person element to be processed. Where a plan is marked as selected
+        it is found directly, otherwise all plans not marked as unselected are returned.
+        :param elem: Person XML element
+        :return: sequence of plan XML elements
+        """
+        plan = elem.find("plan[@selected='yes']")
+        if plan is not None:
+            return (plan,)
+        return [plan for plan in elem.iter("plan") if plan.get("selected") != "no"]
+
     @staticmethod
     def get_furthest_mode(modes):
         """
         Return key with greatest value. Note that in the case of join max, the first is returned only.
         """
+        if len(modes) == 1:  # single mode trips are the common case
+            for mode in modes:
+                return mode
         if len(modes) > 2 and "transit_walk" in modes:
             del modes["transit_walk"]
         return max(modes, key=modes.get)
@@ -91,22 +107,6 @@ class PlanHandlerTool(Tool):
         }
         return list_in, list_indices_map
 
-    def mode_table_position(self, mode, attribute_class, time):
-        """
-        Calculate the result table coordinates from given maps.
-        :param mode: String, mode id
-        :param attribute_class: String, class id
-        :param time: Timestamp of event
-        :return: (x, y, z) tuple of integers to index results table
-        """
-        x = self.mode_indices[mode]
-        y = self.class_indices[attribute_class]
-        z = (
-            floor(time / (86400.0 / self.config.time_periods))
-            % self.config.time_periods
-        )
-        return x, y, z
-
 
 class ModeShares(PlanHandlerTool):
     """
@@ -208,49 +208,62 @@ class ModeShares(PlanHandlerTool):
         """
 
         # Scale final counts
-        self.mode_counts *= 1.0 / self.config.scale_factor
+        np.multiply(self.mode_counts, 1.0 / self.config.scale_factor, out=self.mode_counts)
 
+        # missing attribute classes are labelled "None"
+        classes = ["None" if c is None else c for c in self.classes]
+
+        # the count table is a dense (mode, class, hour) cube, so detailed results are a
+        # direct flatten and totals are sums over its axes (sorted as a groupby would be)
         names = ["mode", "class", "hour"]
-        indexes = [self.modes, self.classes, range(self.config.time_periods)]
+        indexes = [self.modes, classes, range(self.config.time_periods)]
         index = pd.MultiIndex.from_product(indexes, names=names)
-        counts_df = pd.DataFrame(self.mode_counts.flatten(), index=index)
-        counts_df.index = pd.MultiIndex.from_frame(
-            counts_df.index.to_frame().fillna("None")
-        )
-        counts_df.columns = ["count"]
+        counts_df = pd.DataFrame({"count": self.mode_counts.ravel()}, index=index)
         key = f"{self.name}_detailed_counts"
         self.results[key] = counts_df
 
         # mode counts totals by attribute
         if self.groupby_person_attribute:
-            total_grouped_counts_df = counts_df.groupby(["mode", "class"]).sum()
+            grouped_index = pd.MultiIndex.from_product(
+                [self.modes, classes], names=["mode", "class"]
+            )
+            total_grouped_counts_df = pd.DataFrame(
+                {"count": self.mode_counts.sum(axis=2).ravel()}, index=grouped_index
+            ).sort_index()
             key = f"{self.name}_{self.groupby_person_attribute}_counts"
             self.results[key] = total_grouped_counts_df
 
         # mode counts totals output
-        total_counts_df = counts_df.groupby(["mode"]).sum()
+        total_counts_df = pd.DataFrame(
+            {"count": self.mode_counts.sum(axis=(1, 2))},
+            index=pd.Index(self.modes, name="mode"),
+        ).sort_index()
         key = f"{self.name}_counts"
         self.results[key] = total_counts_df
 
-        # convert to mode shares
+        # convert to mode shares, sharing the count indexes
         total = self.mode_counts.sum()
 
         # mode shares breakdown output
         key = f"{self.name}_detailed_shares"
-        shares_df = counts_df / total
-        shares_df.columns = ["share"]
-        self.results[key] = shares_df
+        self.results[key] = pd.DataFrame(
+            {"share": counts_df["count"].to_numpy() / total}, index=counts_df.index
+        )
 
         # mode shares totals by attribute
         if self.groupby_person_attribute:
-            total_grouped_shares_df = shares_df.groupby(["mode", "class"]).sum()
             key = f"{self.name}_{self.groupby_person_attribute}_shares"
-            self.results[key] = total_grouped_shares_df
+            self.results[key] = pd.DataFrame(
+                {"share": total_grouped_counts_df["count"].to_numpy() / total},
+                index=total_grouped_counts_df.index,
+            )
 
         # mode shares totals output
         key = f"{self.name}_shares"
-        total_shares_df = shares_df.groupby(["mode"]).sum()
-        self.results[key] = total_shares_df
+        self.results[key] = pd.DataFrame(
+            {"share": total_counts_df["count"].to_numpy() / total},
+            index=total_counts_df.index,
+        )
 
 
 class TripModes(ModeShares):
@@ -258,79 +271,80 @@ class TripModes(ModeShares):
         """
         :param elem: Plan XML element
         """
-        for plan in elem.xpath(".//plan"):
-            if plan.get("selected") != "no":
-                ident = elem.get("id")
-                attribute_class = self.attributes.get(ident, {}).get(
-                    self.groupby_person_attribute
-                )
-
-                end_time = None
-                trip_modes = {}
+        ident = elem.get("id")
+        attribute_class = self.attributes.get(ident, {}).get(
+            self.groupby_person_attribute
+        )
+        extract_mode = self.extract_mode_from_route_elem
+        mode_indices = self.mode_indices
+        y = self.class_indices[attribute_class]
+        periods = self.config.time_periods
+        mode_counts = self.mode_counts
+        walk_modes = {"egress_walk": "walk", "access_walk": "walk"}
 
-                for stage in plan:
-                    if stage.tag == "leg":
-                        leg_mode = stage.get("mode")
-                        route_elem = stage.xpath("route")[0]
-                        mode = self.extract_mode_from_route_elem(leg_mode, route_elem)
-                        distance = float(route_elem.get("distance", 0))
-                        # ignore access and egress walk
-                        mode = {"egress_walk": "walk", "access_walk": "walk"}.get(
-                            mode, mode
-                        )
-                        trip_modes[mode] = trip_modes.get(mode, 0) + distance
+        for plan in self.selected_plans(elem):
+            end_time = None
+            trip_modes = {}
 
-                    elif stage.tag == "activity":
-                        # ignore pt interaction activities
-                        if stage.get("type") == "pt interaction":
-                            continue
+            for stage in plan:
+                if stage.tag == "leg":
+                    leg_mode = stage.get("mode")
+                    route_elem = stage.find("route")
+                    mode = extract_mode(leg_mode, route_elem)
+                    distance = float(route_elem.get("distance", 0))
+                    # ignore access and egress walk
+                    mode = walk_modes.get(mode, mode)
+                    trip_modes[mode] = trip_modes.get(mode, 0) + distance
 
-                        # only add activity modes when there has been previous activity
-                        # (ie trip start time)
-                        if end_time:
-                            mode = self.get_furthest_mode(trip_modes)
-                            x, y, z = self.mode_table_position(
-                                mode, attribute_class, end_time
-                            )
+                elif stage.tag == "activity":
+                    # ignore pt interaction activities
+                    if stage.get("type") == "pt interaction":
+                        continue
 
-                            self.mode_counts[x, y, z] += 1
+                    # only add activity modes when there has been previous activity
+                    # (ie trip start time)
+                    if end_time:
+                        mode = self.get_furthest_mode(trip_modes)
+                        x = mode_indices[mode]
+                        z = int(end_time * periods // 86400) % periods
+                        mode_counts[x, y, z] += 1
 
-                        # update endtime for next activity
-                        end_time = convert_time_to_seconds(stage.get("end_time"))
+                    # update endtime for next activity
+                    end_time = convert_time_to_seconds(stage.get("end_time"))
 
-                        # reset modes
-                        trip_modes = {}
+                    # reset modes
+                    trip_modes = {}
 
 
 class PlanModes(ModeShares):
     def process_plans(self, elem):
         """ """
-        for plan in elem.xpath(".//plan"):
-            if plan.get("selected") != "no":
-                ident = elem.get("id")
-                attribute_class = self.attributes.get(ident, {}).get(
-                    self.groupby_person_attribute
-                )
-
-                plan_modes = {}
+        ident = elem.get("id")
+        attribute_class = self.attributes.get(ident, {}).get(
+            self.groupby_person_attribute
+        )
+        extract_mode = self.extract_mode_from_route_elem
+        mode_indices = self.mode_indices
+        y = self.class_indices[attribute_class]
+        mode_counts = self.mode_counts
+        walk_modes = {"egress_walk": "walk", "access_walk": "walk"}
 
-                for stage in plan:
-                    if stage.tag == "leg":
-                        leg_mode = stage.get("mode")
-                        route_elem = stage.xpath("route")[0]
-                        mode = self.extract_mode_from_route_elem(leg_mode, route_elem)
-                        distance = float(route_elem.get("distance", 0))
-                        # ignore access and egress walk
-                        mode = {"egress_walk": "walk", "access_walk": "walk"}.get(
-                            mode, mode
-                        )
-                        plan_modes[mode] = plan_modes.get(mode, 0) + distance
+        for plan in self.selected_plans(elem):
+            plan_modes = {}
 
-                if plan_modes:  # stay-home agents have no legs/modes
-                    mode = self.get_furthest_mode(plan_modes)
-                    x, y, z = self.mode_table_position(mode, attribute_class, 0)
+            for stage in plan:
+                if stage.tag == "leg":
+                    leg_mode = stage.get("mode")
+                    route_elem = stage.find("route")
+                    mode = extract_mode(leg_mode, route_elem)
+                    distance = float(route_elem.get("distance", 0))
+                    # ignore access and egress walk
+                    mode = walk_modes.get(mode, mode)
+                    plan_modes[mode] = plan_modes.get(mode, 0) + distance
 
-                    self.mode_counts[x, y, z] += 1
+            if plan_modes:  # stay-home agents have no legs/modes
+                mode = self.get_furthest_mode(plan_modes)
+                mode_counts[mode_indices[mode], y, 0] += 1
 
 
 class TripActivityModes(ModeShares):
@@ -370,48 +384,50 @@ class TripActivityModes(ModeShares):
         the resulting counts will see: (bus) +1 & (train) + 1.
         :param elem: Plan XML element
         """
-        for plan in elem.xpath(".//plan"):
-            if plan.get("selected") != "no":
-                ident = elem.get("id")
-                attribute_class = self.attributes.get(ident, {}).get(
-                    self.groupby_person_attribute
-                )
+        ident = elem.get("id")
+        attribute_class = self.attributes.get(ident, {}).get(
+            self.groupby_person_attribute
+        )
+        extract_mode = self.extract_mode_from_route_elem
+        mode_indices = self.mode_indices
+        y = self.class_indices[attribute_class]
+        periods = self.config.time_periods
+        mode_counts = self.mode_counts
+        walk_modes = {"egress_walk": "walk", "access_walk": "walk"}
 
-                end_time = None
-                trip_modes = {}
+        for plan in self.selected_plans(elem):
+            end_time = None
+            trip_modes = {}
 
-                for stage in plan:
-                    if stage.tag == "leg":
-                        leg_mode = stage.get("mode")
-                        route_elem = stage.xpath("route")[0]
-                        mode = self.extract_mode_from_route_elem(leg_mode, route_elem)
-                        distance = float(route_elem.get("distance", 0))
-                        # ignore access and egress walk
-                        mode = {"egress_walk": "walk", "access_walk": "walk"}.get(
-                            mode, mode
-                        )
-                        trip_modes[mode] = trip_modes.get(mode, 0) + distance
-
-                    elif stage.tag == "activity":
-                        activity = stage.get("type")
-
-                        # only add activity modes when there has been previous activity
-                        # (ie trip start time) AND the activity is in specified list
-                        if end_time:
-                            if activity in self.destination_activity_filters:
-                                mode = self.get_furthest_mode(trip_modes)
-                                x, y, z = self.mode_table_position(
-                                    mode, attribute_class, end_time
-                                )
-                                self.mode_counts[x, y, z] += 1
-                                # reset modes
-                                trip_modes = {}
-                        if (
-                            not activity == "pt interaction"
-                        ):  # reset modes at end of trip
+            for stage in plan:
+                if stage.tag == "leg":
+                    leg_mode = stage.get("mode")
+                    route_elem = stage.find("route")
+                    mode = extract_mode(leg_mode, route_elem)
+                    distance = float(route_elem.get("distance", 0))
+                    # ignore access and egress walk
+                    mode = walk_modes.get(mode, mode)
+                    trip_modes[mode] = trip_modes.get(mode, 0) + distance
+
+                elif stage.tag == "activity":
+                    activity = stage.get("type")
+
+                    # only add activity modes when there has been previous activity
+                    # (ie trip start time) AND the activity is in specified list
+                    if end_time:
+                        if activity in self.destination_activity_filters:
+                            mode = self.get_furthest_mode(trip_modes)
+                            x = mode_indices[mode]
+                            z = int(end_time * periods // 86400) % periods
+                            mode_counts[x, y, z] += 1
+                            # reset modes
                             trip_modes = {}
-                            # update endtime for next activity
-                            end_time = convert_time_to_seconds(stage.get("end_time"))
+                    if (
+                        not activity == "pt interaction"
+                    ):  # reset modes at end of trip
+                        trip_modes = {}
+                        # update endtime for next activity
+                        end_time = convert_time_to_seconds(stage.get("end_time"))
 
 
 class PlanActivityModes(ModeShares):
@@ -435,62 +451,74 @@ class PlanActivityModes(ModeShares):
 
     def process_plans(self, elem):
         """ """
-        for plan in elem.xpath(".//plan"):
-            if plan.get("selected") != "no":
-                ident = elem.get("id")
-                attribute_class = self.attributes.get(ident, {}).get(
-                    self.groupby_person_attribute
-                )
+        ident = elem.get("id")
+        attribute_class = self.attributes.get(ident, {}).get(
+            self.groupby_person_attribute
+        )
+        extract_mode = self.extract_mode_from_route_elem
+        mode_indices = self.mode_indices
+        y = self.class_indices[attribute_class]
+        mode_counts = self.mode_counts
+        walk_modes = {
+            "egress_walk": "walk",
+            "access_walk": "walk",
+            "transit_walk": "walk",
+        }
 
-                end_time = None
-                trip_modes = {}
-                plan_modes = {}
+        for plan in self.selected_plans(elem):
+            end_time = None
+            trip_modes = {}
+            plan_modes = {}
 
-                for stage in plan:
-                    if stage.tag == "leg":
-                        leg_mode = stage.get("mode")
-                        route_elem = stage.xpath("route")[0]
-                        mode = self.extract_mode_from_route_elem(leg_mode, route_elem)
-                        distance = float(route_elem.get("distance", 0))
-                        # ignore access and egress walk
-                        mode = {
-                            "egress_walk": "walk",
-                            "access_walk": "walk",
-                            "transit_walk": "walk",
-                        }.get(mode, mode)
-                        trip_modes[mode] = trip_modes.get(mode, 0) + distance
-
-                    elif stage.tag == "activity":
-                        activity = stage.get("type")
-
-                        # only add activity modes when there has been previous activity
-                        # (ie trip start time) AND the activity is in specified list
-                        if end_time:
-                            if activity in self.destination_activity_filters:
-                                # add modes and distances to plan_modes
-                                for mode, distance in trip_modes.items():
-                                    plan_modes[mode] = (
-                                        plan_modes.get(mode, 0) + distance
-                                    )
-                            # reset modes
-                            trip_modes = {}
-                        if (
-                            not activity == "pt interaction"
-                        ):  # reset modes at end of trip
-                            trip_modes = {}
-                            # update endtime for next activity
-                            end_time = convert_time_to_seconds(stage.get("end_time"))
+            for stage in plan:
+                if stage.tag == "leg":
+                    leg_mode = stage.get("mode")
+                    route_elem = stage.find("route")
+                    mode = extract_mode(leg_mode, route_elem)
+                    distance = float(route_elem.get("distance", 0))
+                    # ignore access and egress walk
+                    mode = walk_modes.get(mode, mode)
+                    trip_modes[mode] = trip_modes.get(mode, 0) + distance
+
+                elif stage.tag == "activity":
+                    activity = stage.get("type")
+
+                    # only add activity modes when there has been previous activity
+                    # (ie trip start time) AND the activity is in specified list
+                    if end_time:
+                        if activity in self.destination_activity_filters:
+                            # add modes and distances to plan_modes
+                            for mode, distance in trip_modes.items():
+                                plan_modes[mode] = (
+                                    plan_modes.get(mode, 0) + distance
+                                )
+                        # reset modes
+                        trip_modes = {}
+                    if (
+                        not activity == "pt interaction"
+                    ):  # reset modes at end of trip
+                        trip_modes = {}
+                        # update endtime for next activity
+                        end_time = convert_time_to_seconds(stage.get("end_time"))
 
-                if plan_modes:
-                    mode = self.get_furthest_mode(plan_modes)
-                    x, y, z = self.mode_table_position(mode, attribute_class, 0)
-                    self.mode_counts[x, y, z] += 1
+            if plan_modes:
+                mode = self.get_furthest_mode(plan_modes)
+                mode_counts[mode_indices[mode], y, 0] += 1
 
 
 class LegLogs(PlanHandlerTool):
     requirements = ["plans", "transit_schedule", "attributes"]
     valid_modes = ["all"]
 
+    activity_columns = [
+        "agent_id", "attribute", "seq", "act", "x", "y", "start", "end", "end_day",
+        "start_s", "end_s", "duration_s",
+    ]
+    leg_columns = [
+        "agent_id", "attribute", "seq", "trip_id", "mode", "ox", "oy", "dx", "dy", "o_act",
+        "d_act", "start", "end", "end_day", "start_s", "end_s", "duration_s", "distance",
+    ]
+
     # todo make it so that 'all' option not required (maybe for all plan handlers)
 
     """
@@ -520,9 +548,6 @@ class LegLogs(PlanHandlerTool):
 
         self.mode = mode
         self.groupby_person_attribute = groupby_person_attribute
-        self.start_datetime = datetime.strptime(
-            "2020:4:1-00:00:00", "%Y:%m:%d-%H:%M:%S"
-        )
 
         self.activities_log = None
         self.legs_log = None
@@ -540,14 +565,15 @@ class LegLogs(PlanHandlerTool):
 
         self.attributes = self.resources["attributes"]
 
-        activity_csv_name = f"{self.name}_activities.csv"
-        legs_csv_name = f"{self.name}_legs.csv"
-
-        self.activities_log = self.start_csv_chunk_writer(
-            activity_csv_name, write_path=write_path, compression=self.compression
+        self.activities_log = self.start_log_chunk_writer(
+            f"{self.name}_activities",
+            write_path=write_path,
+            columns=self.activity_columns,
         )
-        self.legs_log = self.start_csv_chunk_writer(
-            legs_csv_name, write_path=write_path, compression=self.compression
+        self.legs_log = self.start_log_chunk_writer(
+            f"{self.name}_legs",
+            write_path=write_path,
+            columns=self.leg_columns,
         )
 
     def process_plans(self, elem):
@@ -560,117 +586,116 @@ class LegLogs(PlanHandlerTool):
         :return: Tuple[List[dict]]
         """
         ident = elem.get("id")
+        attribute = self.attributes.get(ident, {}).get(
+            self.groupby_person_attribute, None
+        )
+        extract_mode = self.extract_mode_from_route_elem
+        walk_modes = {
+            "egress_walk": "walk",
+            "access_walk": "walk",
+            "transit_walk": "walk",
+        }
 
-        for plan in elem.xpath(".//plan"):
-            if plan.get("selected") != "no":
-                activities = []
-                legs = []
-
-                attribute = self.attributes.get(ident, {}).get(
-                    self.groupby_person_attribute, None
-                )
-
-                leg_seq_idx = 0
-                trip_seq_idx = 0
-                act_seq_idx = 0
-
-                arrival_dt = self.start_datetime
-                activity_end_dt = None
-                x = None
-                y = None
-
-                for stage in plan:
-                    if stage.tag == "activity":
-                        act_seq_idx += 1
-
-                        act_type = stage.get("type")
+        for plan in self.selected_plans(elem):
+            activities = []
+            legs = []
 
-                        if act_type != "pt interaction" or stage.get("end_time"):
-                            end_time_str = stage.get("end_time", "23:59:59")
-                            activity_end_dt = matsim_time_to_datetime(
-                                arrival_dt, end_time_str, self.logger, idx=ident
-                            )
-                        else:
-                            # zero duration for pt interactions without an end_time attribute
-                            activity_end_dt = arrival_dt
+            leg_seq_idx = 0
+            trip_seq_idx = 0
+            act_seq_idx = 0
 
-                        if act_type != "pt interaction":
-                            trip_seq_idx += 1  # increment for a new trip idx
+            arrival_s = 0
+            activity_end_s = None
+            x = None
+            y = None
+            pending_leg = None
 
-                        duration = activity_end_dt - arrival_dt
+            for stage in plan:
+                if stage.tag == "activity":
+                    act_seq_idx += 1
 
-                        x = stage.get("x")
-                        y = stage.get("y")
+                    act_type = stage.get("type")
+                    act_type = intern(act_type) if act_type is not None else None
 
-                        activities.append(
-                            {
-                                "agent_id": ident,
-                                "attribute": attribute,
-                                "seq": act_seq_idx,
-                                "act": act_type,
-                                "x": x,
-                                "y": y,
-                                "start": arrival_dt.time(),
-                                "end": activity_end_dt.time(),
-                                "end_day": activity_end_dt.day,
-                                # 'duration': duration,
-                                "start_s": self.get_seconds(arrival_dt),
-                                "end_s": self.get_seconds(activity_end_dt),
-                                "duration_s": duration.total_seconds(),
-                            }
+                    if act_type != "pt interaction" or stage.get("end_time"):
+                        end_time_str = stage.get("end_time", "23:59:59")
+                        activity_end_s = matsim_time_to_seconds(
+                            arrival_s, end_time_str, self.logger, idx=ident
                         )
+                    else:
+                        # zero duration for pt interactions without an end_time attribute
+                        activity_end_s = arrival_s
+
+                    if act_type != "pt interaction":
+                        trip_seq_idx += 1  # increment for a new trip idx
+
+                    duration = activity_end_s - arrival_s
+
+                    x = stage.get("x")
+                    y = stage.get("y")
+
+                    if pending_leg is not None:
+                        # fill destination of the preceding leg
+                        pending_leg["dx"] = x
+                        pending_leg["dy"] = y
+                        pending_leg["d_act"] = act_type
+                        pending_leg = None
+
+                    activities.append(
+                        {
+                            "agent_id": ident,
+                            "attribute": attribute,
+                            "seq": act_seq_idx,
+                            "act": act_type,
+                            "x": x,
+                            "y": y,
+                            "start": seconds_to_time_str(arrival_s),
+                            "end": seconds_to_time_str(activity_end_s),
+                            "end_day": seconds_to_day(activity_end_s),
+                            # 'duration': duration,
+                            "start_s": arrival_s,
+                            "end_s": activity_end_s,
+                            "duration_s": float(duration),
+                        }
+                    )
 
-                    elif stage.tag == "leg":
-                        leg_seq_idx += 1
-
-                        leg_mode = stage.get("mode")
-                        route_elem = stage.xpath("route")[0]
-                        mode = self.extract_mode_from_route_elem(leg_mode, route_elem)
-                        mode = {
-                            "egress_walk": "walk",
-                            "access_walk": "walk",
-                            "transit_walk": "walk",
-                        }.get(mode, mode)
-
-                        trav_time = stage.get("trav_time")
-                        h, m, s = trav_time.split(":")
-                        td = timedelta(hours=int(h), minutes=int(m), seconds=int(s))
-
-                        arrival_dt = activity_end_dt + td
-
-                        legs.append(
-                            {
-                                "agent_id": ident,
-                                "attribute": attribute,
-                                "seq": leg_seq_idx,
-                                "trip_id": trip_seq_idx,
-                                "mode": mode,
-                                "ox": x,
-                                "oy": y,
-                                "dx": None,
-                                "dy": None,
-                                "o_act": act_type,
-                                "d_act": None,
-                                "start": activity_end_dt.time(),
-                                "end": arrival_dt.time(),
-                                "end_day": arrival_dt.day,
-                                # 'duration': td,
-                                "start_s": self.get_seconds(activity_end_dt),
-                                "end_s": self.get_seconds(arrival_dt),
-                                "duration_s": td.total_seconds(),
-                                "distance": route_elem.get("distance"),
-                            }
-                        )
+                elif stage.tag == "leg":
+                    leg_seq_idx += 1
 
-                for idx, leg in enumerate(legs):
-                    # back-fill leg destinations
-                    leg["dx"] = activities[idx + 1]["x"]
-                    leg["dy"] = activities[idx + 1]["y"]
-                    # back-fill destination activities for legs
-                    leg["d_act"] = activities[idx + 1]["act"]
+                    leg_mode = stage.get("mode")
+                    leg_mode = intern(leg_mode) if leg_mode is not None else None
+                    route_elem = stage.find("route")
+                    mode = extract_mode(leg_mode, route_elem)
+                    mode = walk_modes.get(mode, mode)
+
+                    trav_time_s = convert_time_to_seconds(stage.get("trav_time"))
+                    arrival_s = activity_end_s + trav_time_s
+
+                    pending_leg = {
+                        "agent_id": ident,
+                        "attribute": attribute,
+                        "seq": leg_seq_idx,
+                        "trip_id": trip_seq_idx,
+                        "mode": mode,
+                        "ox": x,
+                        "oy": y,
+                        "dx": None,
+                        "dy": None,
+                        "o_act": act_type,
+                        "d_act": None,
+                        "start": seconds_to_time_str(activity_end_s),
+                        "end": seconds_to_time_str(arrival_s),
+                        "end_day": seconds_to_day(arrival_s),
+                        # 'duration': td,
+                        "start_s": activity_end_s,
+                        "end_s": arrival_s,
+                        "duration_s": float(trav_time_s),
+                        "distance": route_elem.get("distance"),
+                    }
+                    legs.append(pending_leg)
 
-                self.activities_log.add(activities)
-                self.legs_log.add(legs)
+            self.activities_log.add(activities)
+            self.legs_log.add(legs)
 
     def finalise(self):
         """
@@ -679,25 +704,24 @@ class LegLogs(PlanHandlerTool):
         self.activities_log.finish()
         self.legs_log.finish()
 
-    @staticmethod
-    def get_seconds(dt: datetime) -> int:
-        """
-        Extract time of day in seconds from datetime.
-        :param dt: datetime
-        :return: int, seconds
-        """
-        d = dt.day
-        h = dt.hour
-        m = dt.minute
-        s = dt.second
-        return s + (60 * (m + (60 * (h + ((d - 1) * 24)))))
-
 
 class TripLogs(PlanHandlerTool):
     requirements = ["plans", "transit_schedule", "attributes"]
     # mode and purpose options need to be enabled for post-processing cross tabulation w euclidian distance
     valid_modes = ["all"]
 
+    activity_columns = [
+        "agent_id", "attribute", "seq", "act", "x", "y", "start", "start_day", "end", "end_day",
+        "start_s", "end_s", "duration", "duration_s",
+    ]
+    trip_columns = [
+        "agent_id", "attribute", "seq", "mode", "ox", "oy", "dx", "dy", "o_act", "d_act",
+        "start", "start_day", "end", "end_day", "start_s", "end_s", "duration", "duration_s",
+        "distance",
+    ]
+    # trip distances are summed from legs, so may be ints for chunks of unrouted trips
+    trip_dtypes = {"distance": "float64"}
+
     # TODO make it so that 'all' option not required (maybe for all plan handlers)
 
     """
@@ -727,9 +751,6 @@ class TripLogs(PlanHandlerTool):
 
         self.mode = mode
         self.groupby_person_attribute = groupby_person_attribute
-        self.start_datetime = datetime.strptime(
-            "2020:4:1-00:00:00", "%Y:%m:%d-%H:%M:%S"
-        )
 
         self.activities_log = None
         self.trips_log = None
@@ -747,14 +768,16 @@ class TripLogs(PlanHandlerTool):
 
         self.attributes = self.resources["attributes"]
 
-        activity_csv_name = f"{self.name}_activities.csv"
-        trips_csv_name = f"{self.name}_trips.csv"
-
-        self.activities_log = self.start_csv_chunk_writer(
-            activity_csv_name, write_path=write_path, compression=self.compression
+        self.activities_log = self.start_log_chunk_writer(
+            f"{self.name}_activities",
+            write_path=write_path,
+            columns=self.activity_columns,
         )
-        self.trips_log = self.start_csv_chunk_writer(
-            trips_csv_name, write_path=write_path, compression=self.compression
+        self.trips_log = self.start_log_chunk_writer(
+            f"{self.name}_trips",
+            write_path=write_path,
+            columns=self.trip_columns,
+            dtypes=self.trip_dtypes,
         )
 
     def process_plans(self, elem):
@@ -767,146 +790,141 @@ class TripLogs(PlanHandlerTool):
         :return: Tuple[List[dict]]
         """
         ident = elem.get("id")
+        attribute = self.attributes.get(ident, {}).get(
+            self.groupby_person_attribute, None
+        )
+        extract_mode = self.extract_mode_from_route_elem
+        walk_modes = {
+            "egress_walk": "walk",
+            "access_walk": "walk",
+            "transit_walk": "walk",
+        }
 
-        for plan in elem.xpath(".//plan"):
-            attribute = self.attributes.get(ident, {}).get(
-                self.groupby_person_attribute, None
-            )
-
-            if plan.get("selected") != "no":
-                # check that plan starts with an activity
-                if not plan[0].tag == "activity":
-                    raise UserWarning("Plan does not start with activity.")
-                if plan[0].get("type") == "pt interaction":
-                    raise UserWarning(
-                        'Plan cannot start with activity type "pt interaction".'
-                    )
+        for plan in self.selected_plans(elem):
+            # check that plan starts with an activity
+            if not plan[0].tag == "activity":
+                raise UserWarning("Plan does not start with activity.")
+            if plan[0].get("type") == "pt interaction":
+                raise UserWarning(
+                    'Plan cannot start with activity type "pt interaction".'
+                )
 
-                activities = []
-                trips = []
-                act_seq_idx = 0
+            activities = []
+            trips = []
+            act_seq_idx = 0
 
-                activity_start_dt = self.start_datetime
-                activity_end_dt = self.start_datetime
-                # todo replace this start datetime with a real start datetime using config
+            activity_start_s = 0
+            activity_end_s = 0
+            # todo replace this start datetime with a real start datetime using config
 
-                x = None
-                y = None
-                modes = {}
-                trip_distance = 0
+            x = None
+            y = None
+            modes = {}
+            trip_distance = 0
 
-                for stage in plan:
-                    if stage.tag == "activity":
-                        act_type = stage.get("type")
+            for stage in plan:
+                if stage.tag == "activity":
+                    act_type = stage.get("type")
+                    act_type = intern(act_type) if act_type is not None else None
 
-                        if not act_type == "pt interaction":
-                            act_seq_idx += 1  # increment for a new trip idx
-                            trip_duration = activity_start_dt - activity_end_dt
+                    if not act_type == "pt interaction":
+                        act_seq_idx += 1  # increment for a new trip idx
+                        trip_duration = activity_start_s - activity_end_s
 
-                            end_time_str = stage.get("end_time", "23:59:59")
+                        end_time_str = stage.get("end_time", "23:59:59")
 
-                            activity_end_dt = matsim_time_to_datetime(
-                                activity_start_dt, end_time_str, self.logger, idx=ident
-                            )
+                        activity_end_s = matsim_time_to_seconds(
+                            activity_start_s, end_time_str, self.logger, idx=ident
+                        )
 
-                            activity_duration = activity_end_dt - activity_start_dt
-
-                            x = stage.get("x")
-                            y = stage.get("y")
-
-                            if modes:  # add to trips log
-                                trips.append(
-                                    {
-                                        "agent_id": ident,
-                                        "attribute": attribute,
-                                        "seq": act_seq_idx - 1,
-                                        "mode": self.get_furthest_mode(modes),
-                                        "ox": activities[-1]["x"],
-                                        "oy": activities[-1]["y"],
-                                        "dx": x,
-                                        "dy": y,
-                                        "o_act": activities[-1]["act"],
-                                        "d_act": act_type,
-                                        "start": activities[-1]["end"],
-                                        "start_day": activities[-1]["end_day"],
-                                        "end": activity_start_dt.time(),
-                                        "end_day": activity_start_dt.day,
-                                        "start_s": activities[-1]["end_s"],
-                                        "end_s": self.get_seconds(activity_start_dt),
-                                        "duration": trip_duration,
-                                        "duration_s": trip_duration.total_seconds(),
-                                        "distance": trip_distance,
-                                    }
-                                )
+                        activity_duration = activity_end_s - activity_start_s
 
-                                modes = {}  # reset for next trip
-                                trip_distance = 0  # reset for next trip
+                        x = stage.get("x")
+                        y = stage.get("y")
 
-                            activities.append(
+                        if modes:  # add to trips log
+                            trips.append(
                                 {
                                     "agent_id": ident,
                                     "attribute": attribute,
-                                    "seq": act_seq_idx,
-                                    "act": act_type,
-                                    "x": x,
-                                    "y": y,
-                                    "start": activity_start_dt.time(),
-                                    "start_day": activity_start_dt.day,
-                                    "end": activity_end_dt.time(),
-                                    "end_day": activity_end_dt.day,
-                                    "start_s": self.get_seconds(activity_start_dt),
-                                    "end_s": self.get_seconds(activity_end_dt),
-                                    "duration": activity_duration,
-                                    "duration_s": activity_duration.total_seconds(),
+                                    "seq": act_seq_idx - 1,
+                                    "mode": self.get_furthest_mode(modes),
+                                    "ox": activities[-1]["x"],
+                                    "oy": activities[-1]["y"],
+                                    "dx": x,
+                                    "dy": y,
+                                    "o_act": activities[-1]["act"],
+                                    "d_act": act_type,
+                                    "start": activities[-1]["end"],
+                                    "start_day": activities[-1]["end_day"],
+                                    "end": seconds_to_time_str(activity_start_s),
+                                    "end_day": seconds_to_day(activity_start_s),
+                                    "start_s": activities[-1]["end_s"],
+                                    "end_s": activity_start_s,
+                                    "duration": timedelta(seconds=trip_duration),
+                                    "duration_s": float(trip_duration),
+                                    "distance": trip_distance,
                                 }
                             )
 
-                            activity_start_dt = activity_end_dt
+                            modes = {}  # reset for next trip
+                            trip_distance = 0  # reset for next trip
 
-                        # if a 'pt interaction' activity has duration (ie it has an 'end_time' attribute)
-                        # then advance the next activity start time accordingly
-                        elif stage.get("end_time"):
-                            end_time_str = stage.get("end_time")
+                        activities.append(
+                            {
+                                "agent_id": ident,
+                                "attribute": attribute,
+                                "seq": act_seq_idx,
+                                "act": act_type,
+                                "x": x,
+                                "y": y,
+                                "start": seconds_to_time_str(activity_start_s),
+                                "start_day": seconds_to_day(activity_start_s),
+                                "end": seconds_to_time_str(activity_end_s),
+                                "end_day": seconds_to_day(activity_end_s),
+                                "start_s": activity_start_s,
+                                "end_s": activity_end_s,
+                                "duration": timedelta(seconds=activity_duration),
+                                "duration_s": float(activity_duration),
+                            }
+                        )
 
-                            activity_start_dt = matsim_time_to_datetime(
-                                activity_start_dt, end_time_str, self.logger, idx=ident
-                            )
+                        activity_start_s = activity_end_s
 
-                    elif stage.tag == "leg":
-                        leg_mode = stage.get("mode")
+                    # if a 'pt interaction' activity has duration (ie it has an 'end_time' attribute)
+                    # then advance the next activity start time accordingly
+                    elif stage.get("end_time"):
+                        end_time_str = stage.get("end_time")
+
+                        activity_start_s = matsim_time_to_seconds(
+                            activity_start_s, end_time_str, self.logger, idx=ident
+                        )
 
-                        # check for route elements. these are used to infer modes when analyzing output plans
-                        # routes do not exist when analysing input plans (except when they are also simulation outputs)
-                        route_elem = stage.xpath("route")
-                        if route_elem:  # is not [], use route info
-                            route_elem = route_elem[0]
+                elif stage.tag == "leg":
+                    leg_mode = stage.get("mode")
+                    leg_mode = intern(leg_mode) if leg_mode is not None else None
 
-                            distance = float(route_elem.get("distance", 0))
+                    # check for route elements. these are used to infer modes when analyzing output plans
+                    # routes do not exist when analysing input plans (except when they are also simulation outputs)
+                    route_elem = stage.find("route")
+                    if route_elem is not None:  # use route info
+                        distance = float(route_elem.get("distance", 0))
 
-                            mode = self.extract_mode_from_route_elem(
-                                leg_mode, route_elem
-                            )
+                        mode = extract_mode(leg_mode, route_elem)
 
-                            mode = {
-                                "egress_walk": "walk",
-                                "access_walk": "walk",
-                                "transit_walk": "walk",
-                            }.get(mode, mode)
-                            trip_distance += distance
-                        else:  # use leg info
-                            mode = leg_mode
-                            distance = 0  # don't know distances for unrouted trips
+                        mode = walk_modes.get(mode, mode)
+                        trip_distance += distance
+                    else:  # use leg info
+                        mode = leg_mode
+                        distance = 0  # don't know distances for unrouted trips
 
-                        # update mode dictionary with leg or route information
-                        modes[mode] = modes.get(mode, 0) + distance
+                    # update mode dictionary with leg or route information
+                    modes[mode] = modes.get(mode, 0) + distance
 
-                        trav_time = stage.get("trav_time")
-                        h, m, s = trav_time.split(":")
-                        td = timedelta(hours=int(h), minutes=int(m), seconds=int(s))
-                        activity_start_dt += td
+                    activity_start_s += convert_time_to_seconds(stage.get("trav_time"))
 
-                self.activities_log.add(activities)
-                self.trips_log.add(trips)
+            self.activities_log.add(activities)
+            self.trips_log.add(trips)
 
     def finalise(self):
         """
@@ -915,19 +933,6 @@ class TripLogs(PlanHandlerTool):
         self.activities_log.finish()
         self.trips_log.finish()
 
-    @staticmethod
-    def get_seconds(dt: datetime) -> int:
-        """
-        Extract time of day in seconds from datetime.
-        :param dt: datetime
-        :return: int, seconds
-        """
-        d = dt.day
-        h = dt.hour
-        m = dt.minute
-        s = dt.second
-        return s + (60 * (m + (60 * (h + ((d - 1) * 24)))))
-
 
 class UtilityLogs(PlanHandlerTool):
     requirements = ["plans"]
@@ -977,13 +982,12 @@ class UtilityLogs(PlanHandlerTool):
 
         ident = elem.get("id")
 
-        for plan in elem.xpath(".//plan"):
-            if plan.get("selected") != "no":
-                score = plan.get("score")
-                utilities = [{"agent": ident, "score": score}]
-                self.utility_log.add(utilities)
+        for plan in self.selected_plans(elem):
+            score = plan.get("score")
+            utilities = [{"agent": ident, "score": score}]
+            self.utility_log.add(utilities)
 
-                return None
+            return None
 
     def finalise(self):
         """
@@ -1008,6 +1012,17 @@ class PlanLogs(PlanHandlerTool):
 
     requirements = ["plans", "attributes"]
 
+    activity_columns = [
+        "agent_id", "attribute", "plan", "selected", "score", "seq", "act", "x", "y", "start",
+        "start_day", "end", "end_day", "start_s", "end_s", "duration", "duration_s",
+    ]
+    trip_columns = [
+        "agent_id", "attribute", "plan", "selected", "score", "seq", "mode", "ox", "oy", "dx",
+        "dy", "o_act", "d_act", "start", "start_day", "end", "end_day", "start_s", "end_s",
+        "duration", "duration_s", "distance",
+    ]
+    trip_dtypes = {"distance": "float64"}
+
     def __init__(
         self, config, mode="all", groupby_person_attribute="subpopulation", **kwargs
     ):
@@ -1026,9 +1041,6 @@ class PlanLogs(PlanHandlerTool):
 
         self.mode = mode
         self.groupby_person_attribute = groupby_person_attribute
-        self.start_datetime = datetime.strptime(
-            "2020:4:1-00:00:00", "%Y:%m:%d-%H:%M:%S"
-        )
 
         self.trips_log = None
         self.activities_log = None
@@ -1047,13 +1059,16 @@ class PlanLogs(PlanHandlerTool):
 
         self.attributes = self.resources["attributes"]
 
-        self.trips_log = self.start_csv_chunk_writer(
-            f"{self.name}_trips.csv",
+        self.trips_log = self.start_log_chunk_writer(
+            f"{self.name}_trips",
             write_path=write_path,
-            compression=self.compression,
+            columns=self.trip_columns,
+            dtypes=self.trip_dtypes,
         )
-        self.activities_log = self.start_csv_chunk_writer(
-            f"{self.name}_acts.csv", write_path=write_path, compression=self.compression
+        self.activities_log = self.start_log_chunk_writer(
+            f"{self.name}_acts",
+            write_path=write_path,
+            columns=self.activity_columns,
         )
 
     def process_plans(self, elem):
@@ -1066,12 +1081,17 @@ class PlanLogs(PlanHandlerTool):
         :return: Tuple[List[dict]]
         """
         ident = elem.get("id")
+        attribute = self.attributes.get(ident, {}).get(
+            self.groupby_person_attribute, None
+        )
+        extract_mode = self.extract_mode_from_route_elem
+        walk_modes = {
+            "egress_walk": "walk",
+            "access_walk": "walk",
+            "transit_walk": "walk",
+        }
 
-        for pid, plan in enumerate(elem.xpath(".//plan")):
-            attribute = self.attributes.get(ident, {}).get(
-                self.groupby_person_attribute, None
-            )
-
+        for pid, plan in enumerate(elem.iter("plan")):
             selected = plan.get("selected")
             score = float(plan.get("score", 0))
 
@@ -1087,8 +1107,8 @@ class PlanLogs(PlanHandlerTool):
             trips = []
             act_seq_idx = 0
 
-            activity_start_dt = self.start_datetime
-            activity_end_dt = self.start_datetime
+            activity_start_s = 0
+            activity_end_s = 0
             # todo replace this start datetime with a real start datetime using config
 
             x = None
@@ -1099,18 +1119,19 @@ class PlanLogs(PlanHandlerTool):
             for stage in plan:
                 if stage.tag == "activity":
                     act_type = stage.get("type")
+                    act_type = intern(act_type) if act_type is not None else None
 
                     if not act_type == "pt interaction":
                         act_seq_idx += 1  # increment for a new trip idx
-                        trip_duration = activity_start_dt - activity_end_dt
+                        trip_duration = activity_start_s - activity_end_s
 
                         end_time_str = stage.get("end_time", "23:59:59")
 
-                        activity_end_dt = matsim_time_to_datetime(
-                            activity_start_dt, end_time_str, self.logger, idx=ident
+                        activity_end_s = matsim_time_to_seconds(
+                            activity_start_s, end_time_str, self.logger, idx=ident
                         )
 
-                        activity_duration = activity_end_dt - activity_start_dt
+                        activity_duration = activity_end_s - activity_start_s
 
                         x = stage.get("x")
                         y = stage.get("y")
@@ -1133,12 +1154,12 @@ class PlanLogs(PlanHandlerTool):
                                     "d_act": act_type,
                                     "start": activities[-1]["end"],
                                     "start_day": activities[-1]["end_day"],
-                                    "end": activity_start_dt.time(),
-                                    "end_day": activity_start_dt.day,
+                                    "end": seconds_to_time_str(activity_start_s),
+                                    "end_day": seconds_to_day(activity_start_s),
                                     "start_s": activities[-1]["end_s"],
-                                    "end_s": self.get_seconds(activity_start_dt),
-                                    "duration": trip_duration,
-                                    "duration_s": trip_duration.total_seconds(),
+                                    "end_s": activity_start_s % 86400,
+                                    "duration": timedelta(seconds=trip_duration),
+                                    "duration_s": float(trip_duration),
                                     "distance": trip_distance,
                                 }
                             )
@@ -1157,46 +1178,41 @@ class PlanLogs(PlanHandlerTool):
                                 "act": act_type,
                                 "x": x,
                                 "y": y,
-                                "start": activity_start_dt.time(),
-                                "start_day": activity_start_dt.day,
-                                "end": activity_end_dt.time(),
-                                "end_day": activity_end_dt.day,
-                                "start_s": self.get_seconds(activity_start_dt),
-                                "end_s": self.get_seconds(activity_end_dt),
-                                "duration": activity_duration,
-                                "duration_s": activity_duration.total_seconds(),
+                                "start": seconds_to_time_str(activity_start_s),
+                                "start_day": seconds_to_day(activity_start_s),
+                                "end": seconds_to_time_str(activity_end_s),
+                                "end_day": seconds_to_day(activity_end_s),
+                                "start_s": activity_start_s % 86400,
+                                "end_s": activity_end_s % 86400,
+                                "duration": timedelta(seconds=activity_duration),
+                                "duration_s": float(activity_duration),
                             }
                         )
 
-                        activity_start_dt = activity_end_dt
+                        activity_start_s = activity_end_s
 
                     # if a 'pt interaction' activity has duration (ie it has an 'end_time' attribute)
                     # then advance the next activity start time accordingly
                     elif stage.get("end_time"):
                         end_time_str = stage.get("end_time")
 
-                        activity_start_dt = matsim_time_to_datetime(
-                            activity_start_dt, end_time_str, self.logger, idx=ident
+                        activity_start_s = matsim_time_to_seconds(
+                            activity_start_s, end_time_str, self.logger, idx=ident
                         )
 
                 elif stage.tag == "leg":
                     leg_mode = stage.get("mode")
+                    leg_mode = intern(leg_mode) if leg_mode is not None else None
 
                     # check for route elements. these are used to infer modes when analyzing output plans
                     # routes do not exist when analysing input plans (except when they are also simulation outputs)
-                    route_elem = stage.xpath("route")
-                    if route_elem:  # is not [], use route info
-                        route_elem = route_elem[0]
-
+                    route_elem = stage.find("route")
+                    if route_elem is not None:  # use route info
                         distance = float(route_elem.get("distance", 0))
 
-                        mode = self.extract_mode_from_route_elem(leg_mode, route_elem)
+                        mode = extract_mode(leg_mode, route_elem)
 
-                        mode = {
-                            "egress_walk": "walk",
-                            "access_walk": "walk",
-                            "transit_walk": "walk",
-                        }.get(mode, mode)
+                        mode = walk_modes.get(mode, mode)
                         trip_distance += distance
                     else:  # use leg info
                         mode = leg_mode
@@ -1205,10 +1221,7 @@ class PlanLogs(PlanHandlerTool):
                     # update mode dictionary with leg or route information
                     modes[mode] = modes.get(mode, 0) + distance
 
-                    trav_time = stage.get("trav_time")
-                    h, m, s = trav_time.split(":")
-                    td = timedelta(hours=int(h), minutes=int(m), seconds=int(s))
-                    activity_start_dt += td
+                    activity_start_s += convert_time_to_seconds(stage.get("trav_time"))
 
             self.activities_log.add(activities)
             self.trips_log.add(trips)
@@ -1220,18 +1233,6 @@ class PlanLogs(PlanHandlerTool):
         self.trips_log.finish()
         self.activities_log.finish()
 
-    @staticmethod
-    def get_seconds(dt: datetime) -> int:
-        """
-        Extract time of day in seconds from datetime.
-        :param dt: datetime
-        :return: int, seconds
-        """
-        h = dt.hour
-        m = dt.minute
-        s = dt.second
-        return s + (60 * (m + (60 * h)))
-
 
 class AgentTollsPaidFromRPConfig(PlanHandlerTool):
     """
@@ -1321,45 +1322,44 @@ class AgentTollsPaidFromRPConfig(PlanHandlerTool):
                 if time < elem.get("end_time"):
                     return elem.get("amount")
 
-        for plan in elem.xpath(".//plan"):
-            if plan.get("selected") != "no":
-                for stage in plan:
-                    if stage.tag == "leg":
-                        mode = stage.get("mode")
-                        start_time = stage.get("dep_time")
-                        if not mode == self.mode:
-                            continue
-                        route = stage.xpath("route")[0].text.split(" ")
-
-                        for i, link in enumerate(route):
-                            if link in self.roadpricing.links:
-                                current_link_tolled = True
-                            else:
-                                current_link_tolled = False
-
-                            # append results to dictionary if toll applies
-                            if apply_toll(
-                                agent_in_tolled_space, current_link_tolled, start_time
-                            ):
-                                toll_dictionary = {
-                                    "agent_id": ident,
-                                    "subpopulation": attribute,
-                                    "tollname": self.roadpricing.tollnames[link],
-                                    "link_id": link,
-                                    "time": start_time,
-                                    "toll": get_toll(link, start_time),
-                                }
-                                self.toll_log = self.toll_log.append(
-                                    toll_dictionary, ignore_index=True
-                                )
+        for plan in self.selected_plans(elem):
+            for stage in plan:
+                if stage.tag == "leg":
+                    mode = stage.get("mode")
+                    start_time = stage.get("dep_time")
+                    if not mode == self.mode:
+                        continue
+                    route = stage.find("route").text.split(" ")
+
+                    for i, link in enumerate(route):
+                        if link in self.roadpricing.links:
+                            current_link_tolled = True
+                        else:
+                            current_link_tolled = False
 
-                            # update memory of last link
-                            if link in self.roadpricing.links:
-                                agent_in_tolled_space[1] = True
-                            else:
-                                agent_in_tolled_space[1] = False
-                            # use start time as a marker of unique leg
-                            agent_in_tolled_space[0] = start_time
+                        # append results to dictionary if toll applies
+                        if apply_toll(
+                            agent_in_tolled_space, current_link_tolled, start_time
+                        ):
+                            toll_dictionary = {
+                                "agent_id": ident,
+                                "subpopulation": attribute,
+                                "tollname": self.roadpricing.tollnames[link],
+                                "link_id": link,
+                                "time": start_time,
+                                "toll": get_toll(link, start_time),
+                            }
+                            self.toll_log = self.toll_log.append(
+                                toll_dictionary, ignore_index=True
+                            )
+
+                        # update memory of last link
+                        if link in self.roadpricing.links:
+                            agent_in_tolled_space[1] = True
+                        else:
+                            agent_in_tolled_space[1] = False
+                        # use start time as a marker of unique leg
+                        agent_in_tolled_space[0] = start_time
 
     def finalise(self):
         """
@@ -1415,6 +1415,9 @@ class AgentHighwayDistanceLogs(PlanHandlerTool):
         self.ways = None
         self.agent_indices = None
         self.ways_indices = None
+        self.link_indices = None
+        self.link_ways = None
+        self.link_lengths = None
         self.distances = None
 
         # Initialise results storage
@@ -1432,13 +1435,27 @@ class AgentHighwayDistanceLogs(PlanHandlerTool):
         self.osm_ways = resources["osm_ways"]
         self.subpopulations = resources["subpopulations"].map
 
-        # Initialise agent indices
+        # Initialise agent indices, sorted so that the results table is built in output order
         self.agent_ids, self.agent_indices = self.generate_indices_map(
-            list(self.subpopulations)
+            sorted(self.subpopulations)
         )
 
-        # Initialise way indices
-        self.ways, self.ways_indices = self.generate_indices_map(self.osm_ways.classes)
+        # Initialise way indices, sorted for the same reason
+        self.ways, self.ways_indices = self.generate_indices_map(sorted(self.osm_ways.classes))
+
+        # Initialise link lookup arrays, so that each route link costs a single dict lookup.
+        # The final entry is used for links missing from the network, these have no length and
+        # are assigned the "None" way, or -1 where there is no "None" way (raised when found).
+        links, self.link_indices = self.generate_indices_map(list(self.osm_ways.ways))
+        self.link_ways = np.array(
+            [self.ways_indices[self.osm_ways.ways[link]] for link in links]
+            + [self.ways_indices.get("None", -1)],
+            dtype=np.intp,
+        )
+        self.link_lengths = np.array(
+            [self.osm_ways.lengths[link] for link in links] + [0],
+            dtype=np.float64,
+        )
 
         # Initialise results array
         self.distances = np.zeros((len(self.agent_ids), len(self.ways)))
@@ -1449,31 +1466,37 @@ class AgentHighwayDistanceLogs(PlanHandlerTool):
         :param elem: Plan XML element
         """
         ident = elem.get("id")
+        get_link = self.link_indices.get
+        missing = len(self.link_indices)
+        x = self.agent_indices[ident]
 
-        for plan in elem.xpath(".//plan"):
-            if plan.get("selected") != "no":
-                for stage in plan:
-                    if stage.tag == "leg":
-                        mode = stage.get("mode")
-                        if not mode == self.mode:
-                            continue
-
-                        route = stage.xpath("route")[0].text.split(" ")
-                        length = len(route)
-                        for i, link in enumerate(route):
-                            way = str(self.osm_ways.ways.get(link, None))
-                            distance = float(self.osm_ways.lengths.get(link, 0))
-                            if (
-                                i == 0 or i == length - 1
-                            ):  # halve first and last link lengths
-                                distance /= 2
-
-                            x, y = self.table_position(
-                                ident,
-                                way,
-                            )
-
-                            self.distances[x, y] += distance
+        for plan in self.selected_plans(elem):
+            for stage in plan:
+                if stage.tag == "leg":
+                    mode = stage.get("mode")
+                    if not mode == self.mode:
+                        continue
+
+                    route = stage.find("route").text.split(" ")
+                    length = len(route)
+                    links = np.fromiter(
+                        (get_link(link, missing) for link in route),
+                        dtype=np.intp,
+                        count=length,
+                    )
+                    ys = self.link_ways[links]
+                    if ys.min() < 0:
+                        raise KeyError(f"Unknown link in route of {ident} and no 'None' way class")
+                    distances = self.link_lengths[links]
+                    # halve first and last link lengths
+                    distances[0] /= 2
+                    if length > 1:
+                        distances[-1] /= 2
+
+                    # sum distances by way for this agent
+                    self.distances[x] += np.bincount(
+                        ys, weights=distances, minlength=len(self.ways)
+                    )
 
     def finalise(self):
         """
@@ -1481,19 +1504,20 @@ class AgentHighwayDistanceLogs(PlanHandlerTool):
         Finalise aggregates and joins these results as required and creates a dataframe.
         """
 
-        names = ["agent_id", "way"]
-        indexes = [self.agent_ids, self.ways]
-        index = pd.MultiIndex.from_product(indexes, names=names)
-        distance_df = pd.DataFrame(self.distances.flatten(), index=index)[0]
-
-        # mode counts breakdown output
-        distance_df = distance_df.unstack(level="way").sort_index()
+        # the distance table is already dense by (agent, way) and sorted on both, so is
+        # wrapped as is rather than copied
+        distance_df = pd.DataFrame(
+            self.distances,
+            index=pd.Index(self.agent_ids, name="agent_id"),
+            columns=pd.Index(self.ways, name="way"),
+            copy=False,
+        )
 
         # calculate agent total distance
-        distance_df["total"] = distance_df.sum(1)
+        distance_df["total"] = distance_df.to_numpy().sum(axis=1)
 
         # calculate summary
-        total_df = distance_df.sum(0)
+        total_df = pd.Series(distance_df.to_numpy().sum(axis=0), index=distance_df.columns)
         key = f"{self.name}_totals"
         self.results[key] = total_df
 
@@ -1577,48 +1601,49 @@ class TripHighwayDistanceLogs(PlanHandlerTool):
         attribute = self.attributes.get(ident, {}).get(
             self.groupby_person_attribute, None
         )
+        get_way = self.osm_ways.ways.get
+        get_length = self.osm_ways.lengths.get
 
-        for plan in elem.xpath(".//plan"):
-            if plan.get("selected") != "no":
-                trips = []
-                trip_counter = None
-                trip_seq_idx = 0
+        for plan in self.selected_plans(elem):
+            trips = []
+            trip_counter = None
+            trip_seq_idx = 0
 
-                for stage in plan:
-                    if stage.tag == "activity":
-                        if not stage.get("type") == "pt interaction":
-                            if trip_counter is not None:
-                                # record previous counts and move idx
-                                # this 'works' because plans must end with an activity
-                                trips.append(trip_counter)
+            for stage in plan:
+                if stage.tag == "activity":
+                    if not stage.get("type") == "pt interaction":
+                        if trip_counter is not None:
+                            # record previous counts and move idx
+                            # this 'works' because plans must end with an activity
+                            trips.append(trip_counter)
+
+                        trip_seq_idx += 1
+
+                        # set counter
+                        trip_counter = {
+                            "agent_id": ident,
+                            "subpop": attribute,
+                            "seq": trip_seq_idx,
+                        }
+                        trip_counter.update({k: 0 for k in self.ways})
+
+                if stage.tag == "leg":
+                    mode = stage.get("mode")
+                    if not mode == self.mode:
+                        continue
+
+                    route = stage.find("route").text.split(" ")
+                    length = len(route)
+                    for i, link in enumerate(route):
+                        way = str(get_way(link, None))
+                        distance = float(get_length(link, 0))
+                        if (
+                            i == 0 or i == length - 1
+                        ):  # halve first and last link lengths
+                            distance /= 2
+                        trip_counter[way] += distance
 
-                            trip_seq_idx += 1
-
-                            # set counter
-                            trip_counter = {
-                                "agent_id": ident,
-                                "subpop": attribute,
-                                "seq": trip_seq_idx,
-                            }
-                            trip_counter.update({k: 0 for k in self.ways})
-
-                    if stage.tag == "leg":
-                        mode = stage.get("mode")
-                        if not mode == self.mode:
-                            continue
-
-                        route = stage.xpath("route")[0].text.split(" ")
-                        length = len(route)
-                        for i, link in enumerate(route):
-                            way = str(self.osm_ways.ways.get(link, None))
-                            distance = float(self.osm_ways.lengths.get(link, 0))
-                            if (
-                                i == 0 or i == length - 1
-                            ):  # halve first and last link lengths
-                                distance /= 2
-                            trip_counter[way] += distance
-
-                self.distances_log.add(trips)
+            self.distances_log.add(trips)
 
     def finalise(self):
         """
@@ -1671,14 +1696,15 @@ class PlanHandlerWorkStation(WorkStation):
         plans = self.supplier_resources[self.plans_resource]
         self.logger.info(" *** Commencing Plans Iteration ***")
         base = 1
+        processors = [plan_handler.process_plans for plan_handler in self.resources.values()]
 
-        for i, person in enumerate(plans.persons):
-            if not (i + 1) % base:
-                self.logger.info(f"parsed {i + 1} persons plans")
+        for i, person in enumerate(plans.persons, 1):
+            if i == base:
+                self.logger.info(f"parsed {i} persons plans")
                 base *= 2
 
-            for plan_handler in self.resources.values():
-                plan_handler.process_plans(person)
+            for process_plans in processors:
+                process_plans(person)
 
         self.logger.info("***Completed Plan Iteration***")
 
@@ -1722,59 +1748,62 @@ def convert_time_to_seconds(t: str) -> Optional[int]:
     return ((int(t[0]) * 60) + int(t[1])) * 60 + int(t[2])
 
 
-def export_geojson(gdf, path):
-    """
-    Given a geodataframe, export geojson representation to specified path.
-    :param gdf: Input geodataframe
-    :param path: Output path
-    """
-    with open(path, "w") as file:
-        file.write(gdf.to_json())
-
-
-def matsim_time_to_datetime(
-    current_time: datetime,
-    new_time_str: str,
-    logger=None,
-    idx=None,
-    base_year=2020,
-    base_month=4,
-    base_day=1,
-) -> datetime:
+def matsim_time_to_seconds(
+    current_time: int, new_time_str: str, logger=None, idx=None
+) -> int:
     """
-    Function to convert matsim time strings (hours,  minutes and seconds since start)
-    to datetime objects (days, hours, minutes, seconds).
-    Raises a warning for backward time steps. To remmove backward time steps, consider
-    using the 'non_wrapping_datetime' method which has the same arguments.
-    :param current_time: datetime from previous event
+    Function to convert matsim time strings (hours, minutes and seconds since start)
+    to seconds since start. Raises a warning for backward time steps.
+    :param current_time: int, seconds of previous event
     :param new_time_str: new time string
     :param logger: optional logger
     :param idx: optional idx
-    :param base_year: int default=2020,
-    :param base_month: int defaul=4,
-    :param base_day: int defaul=1,
-    :return: time string, day
+    :return: int, seconds
     """
-    start_of_day = datetime(year=base_year, month=base_month, day=base_day, hour=0)
-    if current_time is None:
-        current_time = start_of_day
-
     h, m, s = (int(i) for i in new_time_str.split(":"))
-    new_time = start_of_day + timedelta(hours=h, minutes=m, seconds=s)
+    new_time = ((h * 60) + m) * 60 + s
 
     if logger is not None:
         if h > 23:
             logger.debug(
-                f"Bad time str: {new_time_str}, outputting: {new_time}, idx: {idx}"
+                f"Bad time str: {new_time_str}, outputting: {new_time}s, idx: {idx}"
             )
         if new_time < current_time:
             logger.warning(
-                f"Time Wrapping (new time:{new_time} < previous time:{current_time}), idx: {idx}"
+                f"Time Wrapping (new time:{new_time}s < previous time:{current_time}s), idx: {idx}"
             )
 
     return new_time
 
 
+def seconds_to_time_str(seconds: int) -> str:
+    """
+    Format seconds since start as a time of day string (HH:MM:SS), wrapping at midnight.
+    :param seconds: int
+    :return: str
+    """
+    return f"{seconds // 3600 % 24:02d}:{seconds // 60 % 60:02d}:{seconds % 60:02d}"
+
+
+def seconds_to_day(seconds: int) -> int:
+    """
+    Day of given seconds since start, where the first day is 1.
+    :param seconds: int
+    :return: int
+    """
+    return seconds // 86400 + 1
+
+
+def export_geojson(gdf, path):
+    """
+    Given a geodataframe, export geojson representation to specified path.
+    :param gdf: Input geodataframe
+    :param path: Output path
+    """
+    with open(path, "w") as file:
+        file.write(gdf.to_json())
+
+
 def safe_duration(start_time, end_time):
     """
     Duration calculation that can cope with None as starting time. In which case assumes start time at start
@@ -5,6 +5,7 @@ import logging
 from matplotlib import axes, pyplot as plt
 
 from elara.factory import WorkStation, Tool
+from elara.helpers import read_log
 
 
 class PostProcessor(Tool):
@@ -74,11 +75,11 @@ class PlanTimeSummary(PostProcessor):
 
         file_name = f"leg_logs_{self.mode}_legs.csv"
         file_path = os.path.join(self.config.output_path, file_name)
-        legs_df = pd.read_csv(file_path, index_col=0)
+        legs_df = read_log(file_path, self.config.output_format, index_col=0)
 
         file_name = f"leg_logs_{self.mode}_activities.csv"
         file_path = os.path.join(self.config.output_path, file_name)
-        activity_df = pd.read_csv(file_path, index_col=0)
+        activity_df = read_log(file_path, self.config.output_format, index_col=0)
 
         leg_figure = self.plot_time_bins(legs_df, 'mode')
         leg_figure.suptitle("Travel Time Bins")
@@ -166,7 +167,7 @@ class TripDurationBreakdown(PostProcessor):
         # read trip logs
         file_name = f"trip_logs_{self.mode}_trips.csv"
         file_path = os.path.join(self.config.output_path, file_name)
-        trips_df = pd.read_csv(file_path)
+        trips_df = read_log(file_path, self.config.output_format)
 
         cross_tab_dict = {"mode": trips_df["mode"],
                             "d_act": trips_df["d_act"],
@@ -202,7 +203,7 @@ class TripEuclidDistanceBreakdown(PostProcessor):
         # read trip logs
         file_name = f"trip_logs_{self.mode}_trips.csv"
         file_path = os.path.join(self.config.output_path, file_name)
-        trips_df = pd.read_csv(file_path)
+        trips_df = read_log(file_path, self.config.output_format)
 
         # euclidean distance breakdown
         trips_df['euclidean_distance'] = ((trips_df.ox - trips_df.dx) ** 2 + (trips_df.oy - trips_df.dy) ** 2) ** 0.5
@@ -3,6 +3,7 @@ import os
 import json
 
 from elara.config import Config
+from elara import ConfigError
 
 
 def test_config_override_update_input_fields_and_output_path():
@@ -79,4 +80,28 @@ def test_check_xml_path():
     test_path = os.path.abspath('/not/a/real/file.xml')
     correct_path = os.path.abspath('/not/a/real/file.xml.gz')
     test_method_path = config.check_xml_path(test_path)
-    assert test_method_path == correct_path
\ No newline at end of file
+    assert test_method_path == correct_path
+
+
+def test_benchmark_workers_defaults_to_one():
+    config = Config("tests/test_xml_scenario.toml")
+    assert config.benchmark_workers == 1
+
+
+def test_benchmark_workers_must_be_positive_int():
+    config = Config("tests/test_xml_scenario.toml")
+    config.settings["scenario"]["benchmark_workers"] = 0
+    with pytest.raises(ConfigError):
+        config.benchmark_workers
+
+
+def test_output_format_defaults_to_csv():
+    config = Config("tests/test_xml_scenario.toml")
+    assert config.output_format == "csv"
+
+
+def test_output_format_must_be_csv_or_parquet():
+    config = Config("tests/test_xml_scenario.toml")
+    config.settings["outputs"]["format"] = "xlsx"
+    with pytest.raises(ConfigError):
+        config.output_format
@@ -1,7 +1,9 @@
+import os
 import pytest
+import pandas as pd
 from shapely.geometry import LineString
 
-from elara.helpers import camel_to_snake, decode_polyline_to_shapely_linestring, longest_numeric
+from elara.helpers import camel_to_snake, decode_polyline_to_shapely_linestring, longest_numeric, read_log
 
 
 test_text_data = [
@@ -29,4 +31,20 @@ test_string_data = [
 ]
 @pytest.mark.parametrize("string,number", test_string_data)
 def test_longest_numeric(string, number):
-    assert longest_numeric(string) == number
\ No newline at end of file
+    assert longest_numeric(string) == number
+
+
+def test_read_log_uses_configured_format(tmpdir):
+    csv_path = os.path.join(tmpdir, "log.csv")
+    pd.DataFrame({"seq": [1], "x": ["1.5"]}).to_csv(csv_path)
+    # stale parquet from another run is ignored when reading csv
+    pd.DataFrame({"seq": [2], "x": ["2.5"]}).to_parquet(os.path.join(tmpdir, "log.parquet"), index=False)
+
+    assert read_log(csv_path, "csv", index_col=0).seq.tolist() == [1]
+
+    df = read_log(csv_path, "parquet", index_col="seq")
+    assert df.index.tolist() == [2]
+    assert df.x.tolist() == [2.5]
+
+    assert list(read_log(csv_path, "csv", columns=["seq"]).columns) == ["seq"]
+    assert list(read_log(csv_path, "parquet", columns=["seq"]).columns) == ["seq"]
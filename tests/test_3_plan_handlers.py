@@ -281,17 +281,13 @@ non_wrapping_test_matsim_time_data = [
 
 
 @pytest.mark.parametrize("times,final_string", non_wrapping_test_matsim_time_data)
-def test_matsim_time_to_datetime(times, final_string):
-    current_dt = None
+def test_matsim_time_to_seconds(times, final_string):
+    current_s = 0
     for new_time_str in times:
-        current_dt = plan_handlers.matsim_time_to_datetime(
-            current_dt,
-            new_time_str,
-            base_year=1900,
-            base_month=1,
-        )
-    assert isinstance(current_dt, datetime)
-    assert current_dt == datetime.strptime(f"{final_string}", "%d-%H:%M:%S")
+        current_s = plan_handlers.matsim_time_to_seconds(current_s, new_time_str)
+    day, time_str = final_string.split("-")
+    assert plan_handlers.seconds_to_day(current_s) == int(day)
+    assert plan_handlers.seconds_to_time_str(current_s) == time_str
 
 
 test_durations_data = [
@@ -632,6 +628,27 @@ def test_agent_trip_log_process_person(agent_trip_handler):
     assert handler.activities_log.chunk[1]["end_s"] == 17.5 * 60 * 60
     assert handler.activities_log.chunk[1]["act"] == "work"
 
+def test_agent_trip_log_process_leg_without_mode(agent_trip_handler):
+    handler = agent_trip_handler
+
+    person = """
+    <person id="nick">
+        <plan score="1" selected="yes">
+            <activity type="home" link="1-2" x="0.0" y="0.0" end_time="08:00:00" >
+            </activity>
+            <leg dep_time="08:00:00" trav_time="00:00:04">
+            </leg>
+            <activity type="work" link="1-5" x="0.0" y="10000.0" end_time="17:30:00" >
+            </activity>
+        </plan>
+    </person>
+    """
+    person = etree.fromstring(person)
+    handler.process_plans(person)
+
+    assert handler.trips_log.chunk[0]["duration_s"] == 4
+    assert handler.activities_log.chunk[1]["act"] == "work"
+
 
 def test_agent_trip_log_process_pt_bus_person(agent_trip_handler):
     handler = agent_trip_handler
@@ -766,6 +783,24 @@ def test_finalised_logs(agent_trip_log_handler_finalised):
     assert len(handler.results) == 0
 
 
+@pytest.mark.parametrize("tool,logs", [
+    (plan_handlers.TripLogs, ["activities", "trips"]),
+    (plan_handlers.PlanLogs, ["acts", "trips"]),
+])
+def test_finalised_logs_parquet(test_config, input_manager, tmpdir, tool, logs):
+    test_config.settings["outputs"]["format"] = "parquet"
+    handler = tool(test_config, "all")
+    handler.build(input_manager.resources, write_path=str(tmpdir))
+    for person in handler.resources["plans"].persons:
+        handler.process_plans(person)
+    handler.finalise()
+
+    for log in logs:
+        df = pd.read_parquet(os.path.join(str(tmpdir), f"{handler.name}_{log}.parquet"))
+        assert len(df)
+        assert df.duration.tolist()[0] == str(pd.Timedelta(seconds=int(df.duration_s[0])))
+
+
 # Plans Wrapping case
 
 
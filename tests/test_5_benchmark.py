@@ -436,6 +436,28 @@ def test_input_plan_comparison_activity_duration_zero():
     assert score['mse'] == 0
 
 
+@pytest.mark.parametrize("benchmark", [
+    benchmarking.InputPlanComparisonTripStart,
+    benchmarking.InputPlanComparisonTripDuration,
+    benchmarking.InputPlanComparisonActivityStart,
+    benchmarking.InputPlanComparisonActivityDuration,
+    benchmarking.InputModeComparison,
+])
+def test_input_plan_comparisons_read_parquet_logs(tmpdir, benchmark):
+    for name in ["trip_logs_all_trips", "trip_logs_all_activities"]:
+        for prefix in ["", "input_"]:
+            log = pd.read_csv(os.path.join(config.output_path, f"{prefix}{name}.csv"), index_col=0)
+            log.to_parquet(os.path.join(str(tmpdir), f"{prefix}{name}.parquet"), index=False)
+    parquet_config = Config(config_path)
+    parquet_config.output_path = str(tmpdir)
+    tmpdir.mkdir("benchmarks")
+    parquet_config.settings["outputs"]["format"] = "parquet"
+
+    score = benchmark(config, mode='all').build({}, write_path=test_outputs)
+    parquet_score = benchmark(parquet_config, mode='all').build({}, write_path=test_outputs)
+    assert parquet_score == score
+
+
 @pytest.fixture
 def input_mode_table():
     data = StringIO("""
@@ -641,3 +663,62 @@ def test_benchmark_duration_workstation_dictionary(test_config_dictionary, test_
         test_config_dictionary, 'all', benchmark_data_path='./tests/test_outputs/trip_duration_breakdown_all.csv')
 
     benchmarking_workstation.build(write_path=test_outputs)
+
+
+def test_benchmark_workstation_workers_with_inline_table_config(test_config_dictionary, test_paths):
+    # build benchmarks in worker processes, with a config holding toml inline tables
+    test_config_dictionary.settings["scenario"]["benchmark_workers"] = 2
+    input_workstation = InputsWorkStation(test_config_dictionary)
+    input_workstation.connect(managers=None, suppliers=[test_paths])
+    input_workstation.load_all_tools()
+    input_workstation.build()
+
+    event_workstation = EventHandlerWorkStation(test_config_dictionary)
+    event_workstation.connect(managers=None, suppliers=[input_workstation])
+
+    plan_workstation = PlanHandlerWorkStation(test_config_dictionary)
+    plan_workstation.connect(managers=None, suppliers=[input_workstation])
+
+    bm_workstation = benchmarking.BenchmarkWorkStation(test_config_dictionary)
+    bm_workstation.connect(managers=None, suppliers=[
+                           event_workstation, plan_workstation])
+
+    benchmarking_workstation = benchmarking.BenchmarkWorkStation(
+        test_config_dictionary)
+    benchmarking_workstation.connect(managers=None, suppliers=[
+                                     event_workstation, plan_workstation, bm_workstation])
+    tool = benchmarking_workstation.tools['duration_breakdown_comparison']
+    for name in ['duration_breakown_comparison', 'duration_breakown_comparison--copy']:
+        benchmarking_workstation.resources[name] = tool(
+            test_config_dictionary, 'all', benchmark_data_path='./tests/test_outputs/trip_duration_breakdown_all.csv')
+
+    benchmarking_workstation.build(write_path=test_outputs)
+
+    scores = benchmarking_workstation.flat_summary
+    assert {row[0] for row in scores} == set(benchmarking_workstation.resources)
+
+
+def test_benchmark_workstation_build_without_writing_scores(test_config_dictionary, test_paths, tmpdir):
+    input_workstation = InputsWorkStation(test_config_dictionary)
+    input_workstation.connect(managers=None, suppliers=[test_paths])
+    input_workstation.load_all_tools()
+    input_workstation.build()
+
+    event_workstation = EventHandlerWorkStation(test_config_dictionary)
+    event_workstation.connect(managers=None, suppliers=[input_workstation])
+
+    plan_workstation = PlanHandlerWorkStation(test_config_dictionary)
+    plan_workstation.connect(managers=None, suppliers=[input_workstation])
+
+    benchmarking_workstation = benchmarking.BenchmarkWorkStation(test_config_dictionary)
+    benchmarking_workstation.connect(managers=None, suppliers=[event_workstation, plan_workstation])
+    tool = benchmarking_workstation.tools['duration_breakdown_comparison']
+    benchmarking_workstation.resources['duration_breakown_comparison'] = tool(
+        test_config_dictionary, 'all', benchmark_data_path='./tests/test_outputs/trip_duration_breakdown_all.csv')
+
+    tmpdir.mkdir("benchmarks")
+    benchmarking_workstation.build(write_path=str(tmpdir), write=False)
+
+    assert len(benchmarking_workstation.scores_df)
+    assert not os.path.exists(os.path.join(str(tmpdir), "benchmarks", "benchmark_scores.csv"))
+    assert not os.path.exists(os.path.join(str(tmpdir), "benchmarks", "benchmark_scores.json"))
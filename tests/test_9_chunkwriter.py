@@ -3,7 +3,8 @@ import os
 import pytest
 
 sys.path.append(os.path.abspath('../elara'))
-from elara.factory import CSVChunkWriter, ArrowChunkWriter
+import pandas as pd
+from elara.factory import CSVChunkWriter, ArrowChunkWriter, ParquetChunkWriter, open_text_writer
 
 test_dir = os.path.abspath(os.path.join(os.path.dirname(__file__)))
 test_inputs = os.path.join(test_dir, "test_intermediate_data")
@@ -56,6 +57,145 @@ def test_auto_write_twice(csv_data_streamer):
     assert len(writer.chunk) == 0
 
 
+def test_finish_streams_chunks_to_single_file(csv_data_streamer):
+    path = os.path.join(test_outputs, "test_chunks_finish.csv")
+    writer = CSVChunkWriter(path, chunksize=15)
+    writer.add(csv_data_streamer)
+    writer.add(csv_data_streamer)
+    writer.add(csv_data_streamer)
+    writer.finish()
+    with open(path) as f:
+        lines = f.read().splitlines()
+    assert lines[0] == ",a,b"
+    assert len(lines) == 31
+    assert lines[-1] == "29,1,2"
+
+
+def test_no_chunksize_writes_once_at_finish(csv_data_streamer):
+    path = os.path.join(test_outputs, "test_chunks_unchunked.csv")
+    writer = CSVChunkWriter(path, chunksize=None)
+    writer.add(csv_data_streamer)
+    writer.add(csv_data_streamer)
+    assert len(writer.chunk) == 20
+    writer.finish()
+    assert len(writer.chunk) == 0
+    assert len(pd.read_csv(path, index_col=0)) == 20
+
+
+def test_declared_columns_set_column_order(csv_data_streamer):
+    path = os.path.join(test_outputs, "test_chunks_columns.csv")
+    writer = CSVChunkWriter(path, chunksize=15, columns=['b', 'a'])
+    writer.add(csv_data_streamer)
+    writer.finish()
+    with open(path) as f:
+        lines = f.read().splitlines()
+    assert lines[0] == ",b,a"
+    assert lines[-1] == "9,2,1"
+
+
+def test_parquet_write(csv_data_streamer):
+    path = os.path.join(test_outputs, "test_chunks.parquet")
+    writer = ParquetChunkWriter(path, chunksize=15)
+    writer.add(csv_data_streamer)
+    assert len(writer.chunk) == 10
+    writer.add(csv_data_streamer)
+    assert len(writer.chunk) == 0
+    writer.add(csv_data_streamer)
+    writer.finish()
+    df = pd.read_parquet(path)
+    assert len(df) == 30
+    assert list(df.columns) == ['a', 'b']
+
+
+def test_parquet_write_declared_dtypes_across_chunks():
+    path = os.path.join(test_outputs, "test_chunks_dtypes.parquet")
+    writer = ParquetChunkWriter(path, chunksize=1, dtypes={"distance": "float64"})
+    writer.add([{"seq": 1, "distance": 0}, {"seq": 2, "distance": 0}])
+    writer.add([{"seq": 3, "distance": 1.5}, {"seq": 4, "distance": 2}])
+    writer.finish()
+    df = pd.read_parquet(path)
+    assert df.distance.tolist() == [0.0, 0.0, 1.5, 2.0]
+    assert df.seq.tolist() == [1, 2, 3, 4]
+
+
+def test_parquet_declared_dtype_for_empty_first_chunk_column():
+    path = os.path.join(test_outputs, "test_chunks_empty_column.parquet")
+    writer = ParquetChunkWriter(path, chunksize=1, dtypes={"score": "float64"})
+    writer.add([{"seq": 1, "score": None}, {"seq": 2, "score": None}])
+    writer.add([{"seq": 3, "score": 1.5}, {"seq": 4, "score": 2.5}])
+    writer.finish()
+    df = pd.read_parquet(path)
+    assert df.score.dtype == "float64"
+    assert df.score.tolist()[2:] == [1.5, 2.5]
+
+
+def test_parquet_write_timedelta_as_string():
+    path = os.path.join(test_outputs, "test_chunks_timedelta.parquet")
+    writer = ParquetChunkWriter(path, chunksize=1)
+    writer.add([{"seq": 1, "duration": pd.Timedelta(seconds=90)}, {"seq": 2, "duration": None}])
+    writer.finish()
+    df = pd.read_parquet(path)
+    assert df.duration.tolist()[0] == str(pd.Timedelta(seconds=90))
+    assert df.duration.isna().tolist() == [False, True]
+
+
+def test_parquet_finish_without_lines_writes_columns():
+    path = os.path.join(test_outputs, "test_chunks_no_lines.parquet")
+    if os.path.exists(path):
+        os.remove(path)
+    writer = ParquetChunkWriter(path, columns=["seq", "distance"], dtypes={"distance": "float64"})
+    writer.finish()
+    df = pd.read_parquet(path)
+    assert len(df) == 0
+    assert list(df.columns) == ["seq", "distance"]
+
+
+@pytest.mark.parametrize("compression,suffix", [
+    (None, ""), ("gzip", ".gz"), ("bz2", ".bz2"), ("xz", ".xz"), ("zip", ".zip")
+])
+def test_open_text_writer_round_trip(compression, suffix):
+    path = os.path.join(test_outputs, f"test_text_writer.csv{suffix}")
+    with open_text_writer(path, compression) as f:
+        f.write("a,b\n1,2\n")
+    df = pd.read_csv(path, compression=compression)
+    assert list(df.columns) == ["a", "b"]
+    assert df.values.tolist() == [[1, 2]]
+
+
+def test_open_text_writer_writes_utf8():
+    path = os.path.join(test_outputs, "test_text_writer_utf8.csv")
+    with open_text_writer(path) as f:
+        f.write("a\nJosé\n")
+    with open(path, "rb") as f:
+        assert f.read() == "a\nJosé\n".encode("utf-8")
+
+
+def test_unfinished_writer_leaves_existing_file(csv_data_streamer):
+    path = os.path.join(test_outputs, "test_chunks_unfinished.csv")
+    with open(path, "w") as f:
+        f.write("previous")
+    writer = CSVChunkWriter(path, chunksize=15)
+    writer.add(csv_data_streamer)
+    with open(path) as f:
+        assert f.read() == "previous"
+
+
+def test_open_text_writer_rejects_unknown_compression():
+    with pytest.raises(ValueError):
+        open_text_writer(os.path.join(test_outputs, "test_text_writer.csv"), "rar")
+
+
+def test_compressed_chunks_round_trip(csv_data_streamer):
+    path = os.path.join(test_outputs, "test_chunks_compressed.csv.gz")
+    writer = CSVChunkWriter(path, compression="gzip", chunksize=15)
+    writer.add(csv_data_streamer)
+    writer.add(csv_data_streamer)
+    writer.finish()
+    df = pd.read_csv(path, index_col=0)
+    assert len(df) == 20
+    assert list(df.index) == list(range(20))
+
+
 @pytest.fixture
 def arrow_data_A():
     return [{